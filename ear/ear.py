@@ -9,18 +9,57 @@ New in this version
 • Vosk offline backend (set backend=vosk in config.ini)
 • measure_threshold() to find the right energy_threshold for your room
 • Log-rotation cap read from config.ini (log_max_lines)
+• Triggers compiled into one Aho-Corasick automaton (TriggerMatcher)
+• Vosk streaming session with partial-result triggering (vosk_streaming)
+• Optional Vosk grammar restricted to the known triggers (vosk_grammar)
+• Reaction sounds pre-decoded into an in-memory SoundBank (sound_bank_mb)
+• Sounds played by a PlaybackWorker: EAR keeps listening behind an echo gate
+• backend = hybrid races Vosk and Google on every phrase
+• Local NumPy voice-activity check drops non-speech before recognition (vad)
+• Per-utterance latency traces in a ring buffer (traces), CSV/JSON export
+• keywords.txt / actions.ini / config.ini reloaded automatically on change
+• Optional phonetic / fuzzy fallback for near-miss recognitions (fuzzy)
+• Headless daemon with a local HTTP control API (ear.py --headless / --attach)
+• Command history persisted to SQLite with per trigger / hour / backend counts
+• Audio output and speech backend load in the background (load_state, startup)
+• Rolling noise-floor estimate drives energy_threshold (adaptive_noise); calibrate
+  and measure read it instantly instead of pausing recognition
+• Compiled trigger index cached next to keywords.txt, memory-mapped when unchanged
+• Actions pre-resolved to argv at load time and launched without a shell by
+  an ActionLauncher thread (launch latency in stats, failures reported early)
+• Optional keyword spotter (MFCC + DTW against recorded templates) fires short
+  triggers straight from the capture stream, ahead of the full backend
 """
 
 import configparser
+import hashlib
+import json
+import math
+import mmap
 import os
 import platform
+import queue
+import re
+import shlex
+import shutil
+import sqlite3
+import struct
 import subprocess
+import sys
+import unicodedata
 import threading
 import time
+import types
+import wave
+import heapq
+import itertools
 import logging
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeout
 from pathlib import Path
 
-import pygame
+_STARTED = time.perf_counter()     # reference for the start-up timing report
 
 # ──────────────────────────────────────────────
 # Logging
@@ -49,19 +88,56 @@ _DEFAULTS = {
         "pause_threshold":   "0.5",
         "phrase_time_limit": "3",
         "listen_timeout":    "0.5",
+        "vosk_streaming":    "true",
+        "vosk_partial":      "true",
+        "vosk_grammar":      "false",
+        "hybrid_timeout":    "3",
+        "hybrid_window":     "50",
+        "hybrid_skip_below": "0.05",
+        "hybrid_probe_every": "10",
+        "vad":               "true",
+        "vad_min_voiced_ratio": "0.2",
+        "kws":               "false",
+        "kws_templates":     "kws",
+        "kws_max_distance":  "1.5",
+        "kws_max_word_sec":  "1.2",
     },
     "audio": {
         "energy_threshold": "300",
         "dynamic_energy":   "false",
+        "mixer_buffer":     "512",
+        "sound_bank_mb":    "64",
+        "stream_above_mb":  "2",
+        "playback_preempt": "true",
+        "echo_gate_factor": "3.0",
+        "echo_tail_sec":    "0.3",
+        "adaptive_noise":   "true",
+        "noise_ratio":      "2.0",
+        "noise_min":        "100",
+        "noise_max":        "4000",
+        "noise_window_sec": "10",
+        "noise_hysteresis": "0.15",
     },
     "commands": {
         "cooldown_sec":  "2.0",
         "log_max_lines": "500",
+        "trace_size":    "1000",
+        "watch_interval_sec": "1.0",
+        "word_boundaries": "false",
+        "fuzzy":            "false",
+        "fuzzy_max_ratio":  "0.25",
+        "fuzzy_min_length": "5",
+        "history_db":       "history.db",
     },
     "network": {
         "max_retry":       "5",
         "retry_delay_sec": "3",
     },
+    "daemon": {
+        "host":  "127.0.0.1",
+        "port":  "8765",
+        "token": "",
+    },
 }
 
 
@@ -153,11 +229,984 @@ def load_actions(filepath: str = ACTIONS_FILE) -> dict:
         else:
             logger.warning(f"actions.ini [{trigger}]: unknown type '{kind}'")
 
+    for info in actions.values():
+        resolve_action(info)
     sorted_actions = dict(sorted(actions.items(), key=lambda x: len(x[0]), reverse=True))
     logger.info(f"{len(sorted_actions)} system actions loaded from {filepath}")
     return sorted_actions
 
 
+# Commands using these go through the shell (pipes, redirections, variables…)
+_SHELL_SYNTAX = re.compile(r"[|&;<>`$%]")
+
+
+def resolve_action(info: dict) -> dict:
+    """
+    Work out, once, how to launch an action on this platform without a shell:
+    info["argv"] (absolute executable + arguments), or info["startfile"] (a
+    file opened through its association on Windows).  Commands that need
+    shell syntax keep info["shell"].  info["error"] says why an action cannot
+    work, so it is reported at load time instead of when the trigger is heard.
+    """
+    system = platform.system().lower()
+    info.update(argv=None, startfile=None, shell=None, error=None)
+
+    if info["type"] == "file":
+        path = os.path.abspath(info["path"])
+        opener = {"darwin": "open"}.get(system, "xdg-open")
+        if not os.path.exists(path):
+            info["error"] = f"file not found: {path}"
+        elif system == "windows":
+            info["startfile"] = path
+        elif shutil.which(opener):
+            info["argv"] = [shutil.which(opener), path]
+        else:
+            info["error"] = f"'{opener}' not found to open {os.path.basename(path)}"
+        return info
+
+    cmd = info["command"].get(system, "")
+    if not cmd:
+        info["error"] = f"no command for {platform.system()}"
+    elif _SHELL_SYNTAX.search(cmd):
+        info["shell"] = cmd
+    else:
+        try:
+            argv = [arg.strip('"') for arg in shlex.split(cmd, posix=system != "windows")]
+        except ValueError as e:
+            info["error"] = f"cannot parse '{cmd}': {e}"
+            return info
+        exe = shutil.which(argv[0])
+        if exe:
+            info["argv"] = [exe, *argv[1:]]
+        else:
+            info["error"] = f"executable not found: {argv[0]}"
+    return info
+
+
+# ──────────────────────────────────────────────
+# Trigger matcher (Aho-Corasick)
+# ──────────────────────────────────────────────
+class TriggerMatcher:
+    """
+    Multi-pattern matcher compiled from the actions and commands tables.
+
+    Every trigger gets a rank = its position in (actions…, commands…), both
+    already sorted longest-first by the loaders.  A single pass over the
+    text finds every occurrence; the lowest rank wins, which reproduces the
+    old sequential `trigger in texte` order exactly:
+    system actions before sounds, then longest trigger first.
+    """
+
+    def __init__(self, actions: dict, commands: dict, word_boundaries: bool = False):
+        self.word_boundaries = word_boundaries
+        # rank → (trigger, audio_file, action_info)
+        self._entries: list[tuple] = []
+        for trigger, info in actions.items():
+            self._entries.append((trigger, None, info))
+        for trigger, audio in commands.items():
+            self._entries.append((trigger, audio, None))
+
+        self._goto: list[dict] = [{}]   # node → {char: node}
+        self._fail: list[int]  = [0]
+        self._own:  list[int]  = [-1]   # best rank ending exactly at node
+        self._best: list[int]  = [-1]   # best rank on the whole suffix chain
+        self._out:  list[int]  = [0]    # next node on the chain holding a pattern
+        self._depth: list[int] = [0]
+
+        for rank, (trigger, _, _) in enumerate(self._entries):
+            self._insert(trigger, rank)
+        self._link()
+
+    # Arrays saved by TriggerIndex, in file order
+    _ARRAYS = ("_fail", "_own", "_best", "_out", "_depth")
+
+    def to_arrays(self) -> dict:
+        """Flat int arrays of the automaton; goto becomes CSR (start / char / node)."""
+        arrays = {name: self.__dict__[name] for name in self._ARRAYS}
+        start, chars, nodes = [0], [], []
+        for edges in self._goto:
+            chars.extend(map(ord, edges))
+            nodes.extend(edges.values())
+            start.append(len(chars))
+        arrays.update(edge_start=start, edge_char=chars, edge_node=nodes)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, entries: list, arrays: dict, word_boundaries: bool = False):
+        """Rebuild a matcher around saved arrays (any int sequence, e.g. mmap views)."""
+        self = cls.__new__(cls)
+        self.word_boundaries = word_boundaries
+        self._entries = entries
+        for name in cls._ARRAYS:
+            setattr(self, name, arrays[name])
+        self._goto = _CompactGoto(arrays["edge_start"], arrays["edge_char"], arrays["edge_node"])
+        return self
+
+    def __len__(self):
+        return len(self._entries)
+
+    def triggers(self) -> list[str]:
+        """All trigger phrases, in rank order."""
+        return [entry[0] for entry in self._entries]
+
+    def _insert(self, trigger: str, rank: int):
+        node = 0
+        for ch in trigger:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append(-1)
+                self._best.append(-1)
+                self._out.append(0)
+                self._depth.append(self._depth[node] + 1)
+            node = nxt
+        # A trigger present in both tables keeps its action rank
+        if self._own[node] == -1:
+            self._own[node] = rank
+
+    def _link(self):
+        """Breadth-first pass computing failure links and suffix outputs."""
+        goto, fail, own, best, out = self._goto, self._fail, self._own, self._best, self._out
+        queue = []
+        for child in goto[0].values():
+            best[child] = own[child]
+            queue.append(child)
+        for node in queue:
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                out[child]  = fail[child] if own[fail[child]] != -1 else out[fail[child]]
+                inherited   = best[fail[child]]
+                mine        = own[child]
+                if mine == -1 or (inherited != -1 and inherited < mine):
+                    best[child] = inherited
+                else:
+                    best[child] = mine
+                queue.append(child)
+
+    def can_extend(self, trigger: str) -> bool:
+        """True if a longer trigger starts with this one (e.g. "météo" → "météo demain")."""
+        node = 0
+        for ch in trigger:
+            node = self._goto[node].get(ch, 0)
+        return node != 0 and bool(self._goto[node])
+
+    @staticmethod
+    def _is_boundary(texte: str, start: int, end: int) -> bool:
+        return ((start == 0 or not texte[start - 1].isalnum())
+                and (end == len(texte) or not texte[end].isalnum()))
+
+    def search(self, texte: str) -> tuple:
+        """Return (trigger, audio_file, action_info) for the winning trigger."""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = -1
+        node  = 0
+        for i, ch in enumerate(texte):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] == -1:
+                continue
+            if not self.word_boundaries:
+                if found == -1 or best[node] < found:
+                    found = best[node]
+                    if found == 0:
+                        break
+                continue
+            # Word-boundary mode: walk every pattern ending here
+            hit = node if self._own[node] != -1 else self._out[node]
+            while hit:
+                rank = self._own[hit]
+                if (found == -1 or rank < found) and \
+                        self._is_boundary(texte, i + 1 - self._depth[hit], i + 1):
+                    found = rank
+                hit = self._out[hit]
+        if found == -1:
+            return None, None, None
+        return self._entries[found]
+
+
+class _CompactGoto:
+    """
+    Read-only goto table over CSR arrays.  A node's {char: node} dict is built
+    the first time search() reaches it, so loading costs nothing up front.
+    """
+
+    __slots__ = ("_start", "_char", "_node", "_cache")
+
+    def __init__(self, start, chars, nodes):
+        self._start, self._char, self._node = start, chars, nodes
+        self._cache: dict[int, dict] = {}
+
+    def __len__(self):
+        return len(self._start) - 1
+
+    def __getitem__(self, node: int) -> dict:
+        edges = self._cache.get(node)
+        if edges is None:
+            a, b = self._start[node], self._start[node + 1]
+            edges = {chr(c): n for c, n in zip(self._char[a:b], self._node[a:b])}
+            self._cache[node] = edges
+        return edges
+
+
+# ──────────────────────────────────────────────
+# Compiled trigger index (on-disk cache)
+# ──────────────────────────────────────────────
+class TriggerIndex:
+    """
+    Both trigger tables with sound paths resolved to absolute paths, the set
+    of those that do not exist, and the compiled TriggerMatcher, cached on disk.
+
+    The cache file sits next to keywords.txt and is named after a hash of
+    keywords.txt, actions.ini and the working directory, so an unchanged
+    setup finds it directly.  Layout: magic, JSON header (tables, missing
+    sounds, sound-folder mtimes), then the automaton as int32 arrays that are
+    memory-mapped, not parsed.  A sound folder whose mtime changed (file
+    added or removed) invalidates the cache.
+    """
+
+    MAGIC   = b"EARIDX1\0"
+    ARRAYS  = (*TriggerMatcher._ARRAYS, "edge_start", "edge_char", "edge_node")
+
+    def __init__(self, actions: dict, commands: dict, missing: set, folders: dict,
+                 matcher: TriggerMatcher):
+        self.actions  = actions
+        self.commands = commands          # trigger → absolute sound path
+        self.missing  = missing           # sound paths that do not exist
+        self.folders  = folders           # sound folder → mtime when checked
+        self.matcher  = matcher
+
+    @classmethod
+    def load(cls, keywords_path: str = KEYWORDS_FILE, actions_path: str = ACTIONS_FILE,
+             word_boundaries: bool = False) -> "TriggerIndex":
+        """Cached index when keywords.txt / actions.ini are unchanged, else compile it."""
+        digest = cls._digest(keywords_path, actions_path)
+        folder = os.path.dirname(os.path.abspath(keywords_path))
+        path   = os.path.join(folder, f".keywords-{digest[:16]}.idx")
+        t0 = time.perf_counter()
+        try:
+            index = cls._read(path, digest, word_boundaries)
+            if index:
+                logger.info(f"Trigger index loaded from cache in "
+                            f"{(time.perf_counter() - t0) * 1000:.1f} ms")
+                return index
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Trigger index cache unreadable ({e}) — recompiling")
+
+        index = cls.compile(load_actions(actions_path), load_keywords(keywords_path),
+                            word_boundaries)
+        try:
+            index._write(path, digest)
+            cls._prune(folder, keep=path)
+        except OSError as e:
+            logger.warning(f"Trigger index not cached: {e}")
+        logger.info(f"Trigger index compiled in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return index
+
+    @classmethod
+    def compile(cls, actions: dict, commands: dict, word_boundaries: bool = False):
+        resolved = {trigger: os.path.abspath(audio) for trigger, audio in commands.items()}
+        paths    = set(resolved.values())
+        missing  = {path for path in paths if not os.path.exists(path)}
+        folders  = cls._folder_stamps({os.path.dirname(path) for path in paths})
+        matcher  = TriggerMatcher(actions, resolved, word_boundaries=word_boundaries)
+        return cls(actions, resolved, missing, folders, matcher)
+
+    @staticmethod
+    def _digest(*paths: str) -> str:
+        h = hashlib.sha1(TriggerIndex.MAGIC + sys.byteorder.encode() + os.getcwd().encode())
+        for path in paths:
+            h.update(b"\0")
+            try:
+                with open(path, "rb") as f:
+                    h.update(f.read())
+            except OSError:
+                h.update(b"-")
+        return h.hexdigest()
+
+    @staticmethod
+    def _folder_stamps(folders) -> dict:
+        stamps = {}
+        for folder in folders:
+            try:
+                stamps[folder] = os.stat(folder).st_mtime_ns
+            except OSError:
+                stamps[folder] = None
+        return stamps
+
+    def _write(self, path: str, digest: str):
+        arrays = self.matcher.to_arrays()
+        header = json.dumps({
+            "digest":   digest,
+            "actions":  self.actions,
+            "commands": self.commands,
+            "missing":  sorted(self.missing),
+            "folders":  self.folders,
+            "lengths":  [len(arrays[name]) for name in self.ARRAYS],
+        }, ensure_ascii=False).encode("utf-8")
+        header += b" " * (-len(header) % 4)          # keep the arrays 4-byte aligned
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.MAGIC + struct.pack("<I", len(header)) + header)
+            for name in self.ARRAYS:
+                f.write(array("i", arrays[name]).tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def _read(cls, path: str, digest: str, word_boundaries: bool):
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError("bad magic")
+        pos = len(cls.MAGIC)
+        (size,) = struct.unpack_from("<I", mm, pos)
+        pos += 4
+        header = json.loads(bytes(mm[pos:pos + size]))
+        pos += size
+        folders = header["folders"]
+        if header["digest"] != digest or folders != cls._folder_stamps(folders):
+            return None
+
+        # The views keep the mapping alive for as long as the matcher exists
+        view, arrays = memoryview(mm), {}
+        for name, n in zip(cls.ARRAYS, header["lengths"]):
+            arrays[name] = view[pos:pos + 4 * n].cast("i")
+            pos += 4 * n
+        actions, commands = header["actions"], header["commands"]
+        for info in actions.values():          # PATH / files may have changed since
+            resolve_action(info)
+        entries = [(t, None, info) for t, info in actions.items()] + \
+                  [(t, audio, None) for t, audio in commands.items()]
+        matcher = TriggerMatcher.from_arrays(entries, arrays, word_boundaries)
+        return cls(actions, commands, set(header["missing"]), folders, matcher)
+
+    @staticmethod
+    def _prune(folder: str, keep: str):
+        """Remove caches of earlier versions (a mapped one may be locked: skip it)."""
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            if name.startswith(".keywords-") and name.endswith(".idx") and \
+                    os.path.abspath(path) != os.path.abspath(keep):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+# ──────────────────────────────────────────────
+# Fuzzy trigger index (phonetic key + n-grams)
+# ──────────────────────────────────────────────
+# French grapheme → phoneme rewrites, applied in order to one word.
+# Upper-case letters are phoneme codes so later rules cannot re-match them:
+# A = an/en, I = in/ain/un, N = on, E = é/è/ai, O = au/eau, U = ou, S = ch,
+# W = the "w" of oi.  E is folded back into e at the end (accents are the
+# most common recognizer slip).
+_PHONETIC_RULES = [(re.compile(p), r) for p, r in (
+    (r"(?<=...)er$",                    "E"),     # infinitives: manger
+    (r"s?ch",                           "S"),
+    (r"gu(?=[eiyE])",                   "g"),
+    (r"g(?=[eiyE])",                    "j"),
+    (r"c(?=[eiyE])",                    "s"),
+    (r"(?<=..)[sxtdz]$",                ""),      # silent final consonant
+    (r"(?<=..)e$",                      ""),      # mute final e
+    (r"(?:ai|ei|i|y|u)n(?=[^aeiouyE]|$)", "I"),
+    (r"(?:ai|ei|i|y)m(?=[bp])",         "I"),
+    (r"[ae][nm](?=[^aeiouyE]|$)",       "A"),
+    (r"o[nm](?=[^aeiouyE]|$)",          "N"),
+    (r"eau|au",                         "O"),
+    (r"ai|ei",                          "E"),
+    (r"ou",                             "U"),
+    (r"oi",                             "Wa"),
+    (r"ph",                             "f"),
+    (r"qu|ck",                          "k"),
+    (r"c",                              "k"),
+    (r"gn",                             "n"),
+    (r"(?<=[aeiouyAEINOUW])s(?=[aeiouyAEINOUW])", "z"),
+    (r"x",                              "ks"),
+    (r"w",                              "v"),
+    (r"y",                              "i"),
+    (r"h",                              ""),
+    (r"(.)\1+",                         r"\1"),   # double letters
+)]
+
+
+def phonetic_fr(texte: str) -> str:
+    """
+    Rough French phonetic key: "retouche photo" and "re touche foto" both
+    give "retUSfoto".  Spaces are dropped on purpose so a word
+    split or glued by the recognizer still lines up.
+    """
+    texte = texte.lower().replace("ç", "s")
+    texte = re.sub(r"[éèêë]", "E", texte)
+    texte = "".join(c for c in unicodedata.normalize("NFD", texte)
+                    if not unicodedata.combining(c))
+    key = []
+    for word in re.split(r"[^a-zE]+", texte):
+        for pattern, repl in _PHONETIC_RULES:
+            word = pattern.sub(repl, word)
+        key.append(word)
+    return "".join(key).replace("E", "e")
+
+
+def substring_distance(pattern: str, texte: str) -> int:
+    """
+    Smallest edit distance between `pattern` and any substring of `texte`
+    (Myers' bit-parallel algorithm, one pass over texte).
+    """
+    if not pattern:
+        return 0
+    return _myers(_peq(pattern), len(pattern), texte)
+
+
+def _peq(pattern: str) -> dict:
+    """Bit mask of the positions of each character in `pattern`."""
+    peq: dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _myers(peq: dict, m: int, texte: str) -> int:
+    mask  = (1 << m) - 1
+    high  = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    best = m
+    for ch in texte:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if score < best:
+            best = score
+    return best
+
+
+class FuzzyMatcher:
+    """
+    Near-miss lookup used when no trigger is found verbatim.
+
+    Each trigger is reduced to its phonetic key and indexed by character
+    bigrams.  A query only runs the (bit-parallel) edit distance against
+    triggers sharing enough bigrams to possibly be within budget (q-gram
+    lemma: one edit destroys at most 2 bigrams), then returns the best
+    score.  Triggers whose key is shorter than min_length are skipped:
+    fuzzy-matching "bye" would fire on half the dictionary.
+    """
+
+    Q = 2
+
+    def __init__(self, actions: dict, commands: dict,
+                 max_ratio: float = 0.25, min_length: int = 5):
+        self.max_ratio  = max_ratio
+        self.min_length = min_length
+        self._entries: list[tuple] = []          # id → (trigger, audio, info)
+        self._keys:    list[tuple] = []          # id → (key, peq, budget, min_shared)
+        self._grams:   dict[str, list[int]] = {}
+        self._always:  list[int] = []            # too short to prefilter
+
+        for table, is_action in ((actions, True), (commands, False)):
+            for trigger, value in table.items():
+                key = phonetic_fr(trigger)
+                if len(key) < min_length:
+                    continue
+                entry = (trigger, None, value) if is_action else (trigger, value, None)
+                budget = max(1, int(len(key) * max_ratio))
+                grams  = {key[i:i + self.Q] for i in range(len(key) - self.Q + 1)}
+                min_shared = len(grams) - self.Q * budget
+                self._entries.append(entry)
+                self._keys.append((key, _peq(key), budget, min_shared))
+                tid = len(self._entries) - 1
+                if min_shared <= 0:
+                    self._always.append(tid)
+                for g in grams:
+                    self._grams.setdefault(g, []).append(tid)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def candidates(self, key: str) -> list[int]:
+        shared: dict[int, int] = {}
+        for g in {key[i:i + self.Q] for i in range(len(key) - self.Q + 1)}:
+            for tid in self._grams.get(g, ()):
+                shared[tid] = shared.get(tid, 0) + 1
+        found = {tid for tid, n in shared.items() if n >= self._keys[tid][3]}
+        found.update(self._always)
+        return sorted(found)
+
+    def search(self, texte: str) -> tuple:
+        """Return (trigger, audio_file, action_info, score) or Nones and 0."""
+        key = phonetic_fr(texte)
+        best, best_score = None, 0.0
+        for tid in self.candidates(key):
+            tkey, peq, budget, _ = self._keys[tid]
+            dist = _myers(peq, len(tkey), key)
+            if dist > budget:
+                continue
+            score = 1.0 - dist / len(tkey)
+            # ids follow rank order, so ties keep actions / longer triggers
+            if score > best_score:
+                best, best_score = tid, score
+        if best is None:
+            return None, None, None, 0.0
+        return (*self._entries[best], best_score)
+
+
+# ──────────────────────────────────────────────
+# Sound bank
+# ──────────────────────────────────────────────
+class SoundBank:
+    """
+    Reaction sounds decoded once into pygame.mixer.Sound objects.
+
+    Filled from keywords.txt at load time until the memory budget is used;
+    anything beyond is decoded on first play and the least recently played
+    sounds are evicted to make room.  Files larger than stream_above on disk
+    are never decoded: get() returns None and the caller streams them.
+    """
+
+    def __init__(self, budget_mb: float, stream_above_mb: float):
+        self.budget       = int(budget_mb * 1024 * 1024)
+        self.stream_above = int(stream_above_mb * 1024 * 1024)
+        self._sounds: OrderedDict[str, tuple] = OrderedDict()   # path → (Sound, bytes, stamp)
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sounds)
+
+    @property
+    def used_mb(self) -> float:
+        return self._used / (1024 * 1024)
+
+    def load(self, files, known_missing: set | None = None) -> list[str]:
+        """
+        Decode every referenced file; return the ones that do not exist.
+        The new bank is built aside and swapped in at the end, reusing sounds
+        already decoded whose file is unchanged (same mtime and size), so
+        playback is never blocked by a reload.
+        `known_missing` (from the trigger index) saves one stat call per file.
+        """
+        missing = []
+        with self._lock:
+            previous = dict(self._sounds)
+        sounds: OrderedDict[str, tuple] = OrderedDict()
+        used = 0
+        for fichier in dict.fromkeys(files):
+            if known_missing is not None:
+                absent = fichier in known_missing
+            else:
+                absent = not os.path.exists(fichier)
+            if absent:
+                missing.append(fichier)
+            elif used < self.budget:
+                entry = previous.get(fichier)
+                if not entry or entry[2] != self._stamp(fichier):
+                    entry = self._decode(fichier)
+                if entry:
+                    sounds[fichier] = entry
+                    used += entry[1]
+        with self._lock:
+            self._sounds, self._used = sounds, used
+            self._evict()
+        logger.info(f"Sound bank: {len(sounds)} sounds decoded "
+                    f"({self.used_mb:.1f} MB), {len(missing)} missing")
+        return missing
+
+    @staticmethod
+    def _pcm_size(sound) -> int:
+        import pygame
+        freq, size, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * freq * channels * abs(size) // 8)
+
+    @staticmethod
+    def _stamp(fichier: str) -> tuple | None:
+        try:
+            st = os.stat(fichier)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _decode(self, fichier: str) -> tuple | None:
+        """(Sound, PCM bytes, stamp), or None for files to stream / undecodable."""
+        stamp = self._stamp(fichier)
+        if stamp is None or stamp[1] > self.stream_above:
+            return None
+        import pygame
+        try:
+            sound = pygame.mixer.Sound(fichier)
+        except pygame.error as e:
+            logger.warning(f"Sound bank: cannot decode {fichier}: {e}")
+            return None
+        return sound, self._pcm_size(sound), stamp
+
+    def _evict(self):
+        while self._used > self.budget and len(self._sounds) > 1:
+            _, (_, freed, _) = self._sounds.popitem(last=False)
+            self._used -= freed
+
+    def get(self, fichier: str):
+        """Decoded Sound for `fichier`, or None if it must be streamed."""
+        with self._lock:
+            entry = self._sounds.get(fichier)
+            if entry:
+                self._sounds.move_to_end(fichier)
+                return entry[0]
+            if not os.path.exists(fichier):
+                return None
+            entry = self._decode(fichier)
+            if not entry:
+                return None
+            self._sounds[fichier] = entry
+            self._used += entry[1]
+            self._evict()
+            return entry[0]
+
+
+# ──────────────────────────────────────────────
+# Playback worker
+# ──────────────────────────────────────────────
+class PlaybackWorker:
+    """
+    Plays reaction sounds on its own thread so the listen loop never waits.
+
+    play() and stop() only post to a command queue.  A request with a higher
+    priority than the sound currently playing (or with preempt=True) cuts it
+    off; otherwise it waits its turn, highest priority first, then FIFO.
+    Requests posted before `ready` is set (mixer still starting) are kept.
+    """
+
+    def __init__(self, bank: SoundBank, on_start=None, on_error=None,
+                 ready: threading.Event | None = None):
+        self._bank     = bank
+        self.on_start  = on_start
+        self.on_error  = on_error
+        self._ready    = ready
+        self._cmds: queue.Queue = queue.Queue()
+        self._pending: list[tuple] = []          # heap of (-priority, seq, fichier, trace)
+        self._seq      = itertools.count()
+        self._current: tuple | None = None       # (priority, fichier)
+        self._channel  = None                    # None → streamed via mixer.music
+        self.last_stop = 0.0
+        self._thread   = threading.Thread(target=self._run, daemon=True, name="EAR-playback")
+        self._thread.start()
+
+    @property
+    def is_playing(self) -> bool:
+        return self._current is not None
+
+    def play(self, fichier: str, priority: int = 0, preempt: bool = False, trace=None):
+        self._cmds.put(("play", fichier, priority, preempt, trace))
+
+    def stop(self):
+        """Stop the current sound and drop everything queued."""
+        self._cmds.put(("stop",))
+
+    def _busy(self) -> bool:
+        if self._channel is not None:
+            return self._channel.get_busy()
+        import pygame
+        return pygame.mixer.music.get_busy()
+
+    def _halt(self):
+        if self._current is None:
+            return
+        if self._channel is not None:
+            self._channel.stop()
+        else:
+            import pygame
+            pygame.mixer.music.stop()
+        self._current   = None
+        self._channel   = None
+        self.last_stop  = time.time()
+
+    def _start(self, priority: int, fichier: str, trace=None):
+        try:
+            sound   = self._bank.get(fichier)
+            channel = sound.play() if sound else None
+            if channel is None:
+                # Too big for the bank (or no free channel): stream it
+                import pygame
+                pygame.mixer.music.load(fichier)
+                pygame.mixer.music.play()
+            if trace:
+                trace.mark("play_start")
+            self._channel = channel
+            self._current = (priority, fichier)
+            if self.on_start:
+                self.on_start(fichier)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(f"Audio playback error: {e}")
+
+    def _run(self):
+        if self._ready:
+            self._ready.wait()
+        while True:
+            try:
+                cmd = self._cmds.get(timeout=0.05)
+            except queue.Empty:
+                cmd = None
+
+            if cmd and cmd[0] == "stop":
+                self._pending.clear()
+                self._halt()
+            elif cmd:
+                _, fichier, priority, preempt, trace = cmd
+                if self._current and (preempt or priority > self._current[0]):
+                    self._halt()
+                heapq.heappush(self._pending, (-priority, next(self._seq), fichier, trace))
+
+            if self._current and not self._busy():
+                self._current = None
+                self._channel = None
+                self.last_stop = time.time()
+
+            if not self._current and self._pending:
+                neg_priority, _, fichier, trace = heapq.heappop(self._pending)
+                self._start(-neg_priority, fichier, trace)
+
+
+# ──────────────────────────────────────────────
+# Action launcher
+# ──────────────────────────────────────────────
+def action_label(info: dict) -> str:
+    if info["type"] == "file":
+        return os.path.basename(info["path"])
+    return (info.get("shell") or " ".join(info.get("argv") or [])
+            or next(iter(info["command"].values()), "?"))
+
+
+class ActionLauncher:
+    """
+    Opens files / starts apps on its own thread from actions pre-resolved by
+    resolve_action(), so the listen loop never waits on process creation.
+    Keeps the time each launch took (request picked up → process started).
+    """
+
+    def __init__(self, on_launched=None, on_error=None, keep: int = 200):
+        self.on_launched = on_launched
+        self.on_error    = on_error
+        self.latencies: deque = deque(maxlen=keep)     # seconds
+        self.failures = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="EAR-launch")
+        self._thread.start()
+
+    def submit(self, info: dict):
+        self._queue.put(info)
+
+    def _run(self):
+        while True:
+            info = self._queue.get()
+            t0 = time.perf_counter()
+            try:
+                self._launch(info)
+            except Exception as e:
+                self.failures += 1
+                if self.on_error:
+                    self.on_error(f"Launch failed ({action_label(info)}): {e}")
+                continue
+            elapsed = time.perf_counter() - t0
+            self.latencies.append(elapsed)
+            if self.on_launched:
+                self.on_launched(info, elapsed)
+
+    @staticmethod
+    def _launch(info: dict):
+        quiet = dict(stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, close_fds=True)
+        if info.get("argv"):
+            subprocess.Popen(info["argv"], **quiet)
+        elif info.get("startfile"):
+            os.startfile(info["startfile"])
+        elif info.get("shell"):
+            subprocess.Popen(info["shell"], shell=True, **quiet)
+        else:
+            raise OSError(info.get("error") or "nothing to launch")
+
+    def summary(self) -> dict:
+        values = sorted(self.latencies)
+        if not values:
+            return {"launches": 0, "failures": self.failures}
+        return {
+            "launches": len(values),
+            "failures": self.failures,
+            "p50_ms":   round(values[int(0.50 * (len(values) - 1))] * 1000, 1),
+            "p95_ms":   round(values[int(0.95 * (len(values) - 1))] * 1000, 1),
+        }
+
+
+# ──────────────────────────────────────────────
+# Voice activity detection
+# ──────────────────────────────────────────────
+class SpeechDetector:
+    """
+    Cheap local check run on each captured phrase before it is sent off.
+
+    The phrase is cut into 20 ms frames; a frame counts as voiced when it is
+    loud enough, its zero-crossing rate is in the range of voiced speech and
+    most of its energy lies in the speech band.  Chair scrapes (broadband,
+    high ZCR) and hum or bass-heavy music (low ZCR, energy below the band)
+    fail those tests and the phrase is dropped without a network call.
+    """
+
+    FRAME_MS = 20
+
+    def __init__(self, min_voiced_ratio: float = 0.2, min_voiced_ms: int = 120,
+                 zcr_range: tuple = (0.02, 0.25), band_hz: tuple = (250, 3500),
+                 min_band_ratio: float = 0.55):
+        try:
+            import numpy as np
+            self._np = np
+        except ImportError:
+            raise ImportError(
+                "Voice activity detection requires 'numpy'.\n"
+                "Run: pip install numpy  (or set vad = false in config.ini)"
+            )
+        self.min_voiced_ratio = min_voiced_ratio
+        self.min_voiced_ms    = min_voiced_ms
+        self.zcr_range        = zcr_range
+        self.band_hz          = band_hz
+        self.min_band_ratio   = min_band_ratio
+        self.passed  = 0
+        self.dropped = 0
+
+    def is_speech(self, pcm: bytes, sample_rate: int, energy_floor: float) -> bool:
+        np = self._np
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        frame   = sample_rate * self.FRAME_MS // 1000
+        n       = len(samples) // frame
+        if n == 0:
+            self.dropped += 1
+            return False
+        frames = samples[:n * frame].reshape(n, frame)
+
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+        spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame), axis=1)) ** 2
+        freqs    = np.fft.rfftfreq(frame, 1.0 / sample_rate)
+        in_band  = (freqs >= self.band_hz[0]) & (freqs <= self.band_hz[1])
+        band_ratio = spectrum[:, in_band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-9)
+
+        voiced = ((rms >= energy_floor)
+                  & (zcr >= self.zcr_range[0]) & (zcr <= self.zcr_range[1])
+                  & (band_ratio >= self.min_band_ratio))
+        count  = int(voiced.sum())
+        ok = (count / n >= self.min_voiced_ratio
+              and count * self.FRAME_MS >= self.min_voiced_ms)
+        if ok:
+            self.passed += 1
+        else:
+            self.dropped += 1
+        return ok
+
+
+# ──────────────────────────────────────────────
+# Adaptive noise floor
+# ──────────────────────────────────────────────
+class NoiseFloor:
+    """
+    Rolling estimate of the room's background level, fed with the RMS of the
+    blocks the listen loop reads anyway.
+
+    Minimum statistics: the smoothed level's minimum over each second is kept
+    for `window` seconds and the floor is the lowest of them, so speech (never
+    that long without a pause) does not raise it, while a fan switched on does
+    after one window.  The threshold follows floor × ratio within [low, high]:
+    once per second, unless the current block is speech, it moves half-way to
+    that target, and only when the gap is larger than `hysteresis` × threshold.
+    """
+
+    SMOOTHING = 0.5        # per-block exponential smoothing of the level
+
+    def __init__(self, threshold: float, ratio: float = 2.0, low: float = 100,
+                 high: float = 4000, window: float = 10, hysteresis: float = 0.15):
+        self.threshold = float(threshold)
+        self._minima: deque = deque()
+        self._smooth: float | None = None
+        self._second_min  = math.inf
+        self._second_time = 0.0
+        self.configure(ratio, low, high, window, hysteresis)
+
+    def configure(self, ratio: float, low: float, high: float, window: float,
+                  hysteresis: float):
+        self.ratio, self.low, self.high, self.hysteresis = ratio, low, high, hysteresis
+        self._minima = deque(self._minima, maxlen=max(1, int(window)))
+
+    @property
+    def floor(self) -> float | None:
+        """Estimated background RMS, None until one second has been heard."""
+        return min(self._minima) if self._minima else None
+
+    def target(self) -> float | None:
+        floor = self.floor
+        if floor is None:
+            return None
+        return min(self.high, max(self.low, floor * self.ratio))
+
+    def feed(self, rms: float, seconds: float) -> float | None:
+        """Add one block of audio; return the new threshold when it moved."""
+        if self._smooth is None:
+            self._smooth = rms
+        self._smooth += self.SMOOTHING * (rms - self._smooth)
+        self._second_min   = min(self._second_min, self._smooth)
+        self._second_time += seconds
+        if self._second_time < 1.0:
+            return None
+        self._minima.append(self._second_min)
+        self._second_min, self._second_time = math.inf, 0.0
+
+        target = self.target()
+        # Hold still while someone talks (louder than both old and new threshold)
+        if rms >= max(self.threshold, target) or \
+                abs(target - self.threshold) <= self.hysteresis * self.threshold:
+            return None
+        self.threshold += (target - self.threshold) / 2
+        return self.threshold
+
+    def snap(self) -> float | None:
+        """Jump straight to the target (calibrate button); None without data."""
+        target = self.target()
+        if target is not None:
+            self.threshold = target
+        return target
+
+
+class _MicTap:
+    """Wraps sr.Microphone's stream so each chunk Recognizer.listen() reads is also measured."""
+
+    def __init__(self, stream, on_chunk):
+        self._stream   = stream
+        self._on_chunk = on_chunk
+
+    def read(self, size):
+        data = self._stream.read(size)
+        self._on_chunk(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
 # ──────────────────────────────────────────────
 # Vosk backend
 # ──────────────────────────────────────────────
@@ -168,9 +1217,11 @@ class VoskBackend:
         try:
             from vosk import Model, KaldiRecognizer
             import sounddevice as sd
+            import numpy as np
             import json
             self._json   = json
             self._sd     = sd
+            self._np     = np
             self._KaldiR = KaldiRecognizer
             if not os.path.exists(model_path):
                 raise FileNotFoundError(
@@ -179,6 +1230,8 @@ class VoskBackend:
                     "and extract to that path."
                 )
             self._model = Model(model_path)
+            self._grammar: str | None = None
+            self._grammar_changed = threading.Event()
             logger.info(f"Vosk model loaded: {model_path}")
         except ImportError:
             raise ImportError(
@@ -186,22 +1239,692 @@ class VoskBackend:
                 "Run: pip install vosk sounddevice"
             )
 
-    def listen_once(self, phrase_limit: float) -> str | None:
-        samplerate = 16000
-        rec = self._KaldiR(self._model, samplerate)
-        max_blocks = int(phrase_limit * samplerate / 512)
+    SAMPLERATE = 16000
+    BLOCKSIZE  = 512
+
+    def _new_recognizer(self):
+        if self._grammar:
+            return self._KaldiR(self._model, self.SAMPLERATE, self._grammar)
+        return self._KaldiR(self._model, self.SAMPLERATE)
+
+    def set_grammar(self, phrases: list[str] | None):
+        """
+        Restrict decoding to the given phrases (+ "[unk]" for everything
+        else), or lift the restriction with None.  A running stream() picks
+        the new grammar up on its next audio block, which resets the
+        recognizer mid-utterance: an unchanged grammar is therefore ignored.
+        """
+        grammar = (self._json.dumps(sorted(set(phrases)) + ["[unk]"], ensure_ascii=False)
+                   if phrases else None)
+        if grammar == self._grammar:
+            return
+        self._grammar = grammar
+        if phrases:
+            logger.info(f"Vosk grammar: {len(phrases)} phrases")
+        self._grammar_changed.set()
+
+    def _rms(self, data: bytes) -> float:
+        samples = self._np.frombuffer(data, dtype=self._np.int16).astype(self._np.float32)
+        return float(self._np.sqrt(self._np.mean(samples * samples))) if samples.size else 0.0
+
+    def recognize(self, pcm: bytes) -> str | None:
+        """Decode one already-captured phrase (16 kHz mono int16)."""
+        rec = self._new_recognizer()
+        rec.AcceptWaveform(pcm)
+        text = self._json.loads(rec.FinalResult()).get("text", "")
+        return text.replace("[unk]", "").strip() or None
+
+    def listen_once(self, phrase_limit: float, gate=lambda: 0, on_level=None,
+                    tap=None) -> str | None:
+        samplerate = self.SAMPLERATE
+        rec = self._new_recognizer()
+        max_blocks = int(phrase_limit * samplerate / self.BLOCKSIZE)
 
         with self._sd.InputStream(samplerate=samplerate, channels=1,
-                                   dtype="int16", blocksize=512) as stream:
+                                   dtype="int16", blocksize=self.BLOCKSIZE) as stream:
             for _ in range(max_blocks):
-                data, _ = stream.read(512)
-                if rec.AcceptWaveform(data.tobytes()):
+                data, _ = stream.read(self.BLOCKSIZE)
+                data = data.tobytes()
+                if on_level:
+                    on_level(self._rms(data), self.BLOCKSIZE / samplerate)
+                if tap:
+                    tap(data)
+                level = gate()
+                if level and self._rms(data) < level:
+                    data = bytes(len(data))
+                if rec.AcceptWaveform(data):
                     result = self._json.loads(rec.Result())
-                    text = result.get("text", "").strip()
+                    text = result.get("text", "").replace("[unk]", "").strip()
                     if text:
                         return text
 
-        return self._json.loads(rec.FinalResult()).get("text", "").strip() or None
+        text = self._json.loads(rec.FinalResult()).get("text", "")
+        return text.replace("[unk]", "").strip() or None
+
+    def stream(self, running, gate=lambda: 0, source=None, on_level=None, tap=None):
+        """
+        Persistent session: one input stream + one recognizer for as long as
+        running() is true.  Yields ("partial", text, …) whenever the
+        hypothesis changes and ("final", text, …) when Vosk closes an
+        utterance, so no audio is lost between phrases; the last two items
+        are when the block that produced it was captured and picked up.
+        While gate() returns a non-zero RMS level (our own speakers are
+        playing), quieter blocks are fed as silence so only someone talking
+        over the sound gets through.  on_level(rms, seconds) is called for
+        every block (noise-floor tracking), tap(pcm) with every raw block
+        (keyword spotting).
+
+        `source` replaces the microphone with an iterable of
+        (captured_at, pcm bytes) blocks — offline replay; the last words
+        are then flushed as a final result when it runs out.
+        """
+        if source is not None:
+            yield from self._decode_blocks(source, gate, on_level, tap, finish=True)
+            return
+
+        blocks: queue.Queue = queue.Queue()
+
+        def _callback(indata, frames, time_info, status):
+            blocks.put((time.perf_counter(), bytes(indata)))
+
+        def _live():
+            while running():
+                try:
+                    yield blocks.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+        with self._sd.RawInputStream(samplerate=self.SAMPLERATE, channels=1,
+                                      dtype="int16", blocksize=self.BLOCKSIZE,
+                                      callback=_callback):
+            yield from self._decode_blocks(_live(), gate, on_level, tap)
+
+    def _decode_blocks(self, blocks, gate, on_level=None, tap=None, finish: bool = False):
+        rec = self._new_recognizer()
+        last_partial = ""
+        captured_at = dequeued_at = time.perf_counter()
+
+        for captured_at, data in blocks:
+            dequeued_at = time.perf_counter()
+
+            if self._grammar_changed.is_set():
+                self._grammar_changed.clear()
+                rec = self._new_recognizer()
+                last_partial = ""
+
+            if on_level:
+                on_level(self._rms(data), len(data) / 2 / self.SAMPLERATE)
+            if tap:
+                tap(data)
+            level = gate()
+            if level and self._rms(data) < level:
+                data = bytes(len(data))
+
+            if rec.AcceptWaveform(data):
+                text = self._json.loads(rec.Result()).get("text", "").strip()
+                text = text.replace("[unk]", "").strip()
+                last_partial = ""
+                yield "final", text, captured_at, dequeued_at
+            else:
+                partial = self._json.loads(rec.PartialResult()).get("partial", "")
+                partial = partial.replace("[unk]", "").strip()
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield "partial", partial, captured_at, dequeued_at
+
+        if finish:
+            text = self._json.loads(rec.FinalResult()).get("text", "")
+            yield "final", text.replace("[unk]", "").strip(), captured_at, dequeued_at
+
+
+# ──────────────────────────────────────────────
+# Keyword spotting (MFCC + DTW)
+# ──────────────────────────────────────────────
+def read_wav(path: str, rate: int = 16000) -> bytes:
+    """`rate` Hz mono int16 PCM of `path` (downmixed / resampled if needed)."""
+    with wave.open(path, "rb") as w:
+        src_rate, channels, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    if (src_rate, channels, width) == (rate, 1, 2):
+        return raw
+    import numpy as np
+    if width != 2:
+        raise ValueError(f"{path}: only 16-bit WAV is supported")
+    samples = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels).mean(axis=1)
+    n_out   = int(len(samples) * rate / src_rate)
+    samples = np.interp(np.linspace(0, len(samples) - 1, n_out),
+                        np.arange(len(samples)), samples)
+    return samples.astype(np.int16).tobytes()
+
+
+class KeywordSpotter:
+    """
+    Fast path for short fixed triggers ("stop", "patate"…).  The capture
+    stream is cut into isolated words on energy; on a worker thread each
+    word's MFCCs are compared by dynamic time warping with a few recorded
+    templates per trigger.  A close match fires within tens of ms of the end
+    of the word; anything else is left to the full backend, which hears the
+    same audio anyway.
+
+    Templates are 16-bit WAV files named like replay recordings, one word
+    each: kws/stop__1.wav, kws/stop__2.wav, kws/au_revoir__1.wav…
+    """
+
+    RATE     = 16000
+    FRAME    = 400         # 25 ms analysis window
+    HOP      = 160         # 10 ms
+    NFFT     = 512
+    N_MELS   = 26
+    N_MFCC   = 13
+    GAP_SEC  = 0.15        # silence allowed inside one word
+    MIN_SEC  = 0.15        # shorter bursts are clicks, not words
+    HOLD_SEC = 5.0         # the full backend's answer for a spotted word is ignored
+
+    def __init__(self, folder: str, max_distance: float = 1.5,
+                 max_word_sec: float = 1.2, on_spot=None):
+        try:
+            import numpy as np
+            self._np = np
+        except ImportError:
+            raise ImportError("Keyword spotting requires numpy.\nRun: pip install numpy")
+        self.max_distance = max_distance
+        self.max_word_sec = max_word_sec
+        self.on_spot      = on_spot
+        self._fbank, self._dct = self._filters()
+        self.templates: dict[str, list] = self.load(folder)
+
+        self.spotted = self.rejected = 0
+        self.latencies: deque = deque(maxlen=200)    # end of word → match, seconds
+        self._fired: dict[str, float] = {}
+
+        # Word segmenter state (capture thread only)
+        self._pre = None                 # last quiet block, kept as pre-roll
+        self._blocks: list | None = None
+        self._active  = False
+        self._length  = self._silent = 0.0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=4)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="EAR-kws")
+        self._thread.start()
+
+    def __len__(self):
+        return len(self.templates)
+
+    # ── Features ──────────────────────────────
+    def _filters(self) -> tuple:
+        """Mel filterbank (N_MELS × NFFT/2+1) and DCT-II matrix (N_MFCC × N_MELS)."""
+        np = self._np
+        to_mel = lambda hz: 2595 * np.log10(1 + hz / 700)
+        to_hz  = lambda mel: 700 * (10 ** (mel / 2595) - 1)
+        edges  = to_hz(np.linspace(to_mel(60), to_mel(self.RATE / 2), self.N_MELS + 2))
+        bins   = np.floor((self.NFFT + 1) * edges / self.RATE).astype(int)
+        fbank  = np.zeros((self.N_MELS, self.NFFT // 2 + 1), dtype=np.float32)
+        for m in range(1, self.N_MELS + 1):
+            lo, mid, hi = bins[m - 1], bins[m], bins[m + 1]
+            fbank[m - 1, lo:mid] = (np.arange(lo, mid) - lo) / max(mid - lo, 1)
+            fbank[m - 1, mid:hi] = (hi - np.arange(mid, hi)) / max(hi - mid, 1)
+        k   = np.arange(self.N_MELS)
+        dct = np.cos(np.pi / self.N_MELS * (k + 0.5)[None, :] * np.arange(self.N_MFCC)[:, None])
+        return fbank, dct.astype(np.float32)
+
+    def _trim(self, samples):
+        """Drop leading / trailing 10 ms windows 20 dB below the loudest one."""
+        np = self._np
+        n = len(samples) // self.HOP
+        if n < 3:
+            return samples
+        x = samples[:n * self.HOP].astype(np.float32).reshape(n, self.HOP)
+        rms = np.sqrt((x * x).mean(axis=1))
+        keep = np.flatnonzero(rms >= rms.max() * 0.1)
+        return samples[keep[0] * self.HOP:(keep[-1] + 1) * self.HOP]
+
+    def features(self, samples):
+        """Per-utterance normalised MFCCs (frames × N_MFCC) of 16 kHz int16 samples."""
+        np = self._np
+        x = samples.astype(np.float32)
+        x = np.append(x[0], x[1:] - 0.97 * x[:-1])
+        if len(x) < self.FRAME:
+            x = np.pad(x, (0, self.FRAME - len(x)))
+        n = 1 + (len(x) - self.FRAME) // self.HOP
+        idx = np.arange(self.FRAME)[None, :] + self.HOP * np.arange(n)[:, None]
+        frames = x[idx] * np.hamming(self.FRAME).astype(np.float32)
+        power  = np.abs(np.fft.rfft(frames, self.NFFT)) ** 2 / self.NFFT
+        ceps   = np.log(power @ self._fbank.T + 1e-6) @ self._dct.T
+        return (ceps - ceps.mean(axis=0)) / (ceps.std(axis=0) + 1e-6)
+
+    def dtw(self, a, b) -> float:
+        """
+        DTW distance between two feature sequences, normalised by their total
+        length.  Local slopes are limited to 1/2…2 (steps (1,1), (1,2), (2,1)),
+        which keeps every row a function of the previous two only, so each
+        row is one vectorised NumPy step instead of a Python loop per cell.
+        """
+        np = self._np
+        n, m = len(a), len(b)
+        if n > 2 * m or m > 2 * n:
+            return float("inf")
+        cost = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+        c = np.full((n + 2, m + 2), np.inf, dtype=np.float32)
+        c[2:, 2:] = cost
+        d = np.full_like(c, np.inf)
+        d[2, 2] = c[2, 2]
+        for i in range(3, n + 2):
+            d[i, 2:] = c[i, 2:] + np.minimum(
+                d[i - 1, 1:-1],
+                np.minimum(d[i - 1, :-2] + c[i, 1:-1], d[i - 2, 1:-1] + c[i - 1, 2:]))
+        return float(d[n + 1, m + 1]) / (n + m)
+
+    # ── Templates ─────────────────────────────
+    def load(self, folder: str) -> dict:
+        """trigger → [feature arrays] from the WAV files in `folder`."""
+        templates: dict[str, list] = {}
+        if not os.path.isdir(folder):
+            logger.warning(f"Keyword spotting: template folder '{folder}' not found")
+            return templates
+        for name in sorted(os.listdir(folder)):
+            if not name.lower().endswith(".wav"):
+                continue
+            trigger = os.path.splitext(name)[0].split("__")[0].replace("_", " ").lower()
+            try:
+                pcm = read_wav(os.path.join(folder, name), self.RATE)
+            except (OSError, ValueError, wave.Error) as e:
+                logger.warning(f"Keyword spotting: skipping {name}: {e}")
+                continue
+            samples = self._trim(self._np.frombuffer(pcm, dtype=self._np.int16))
+            templates.setdefault(trigger, []).append(self.features(samples))
+        logger.info(f"Keyword spotting: {sum(map(len, templates.values()))} templates "
+                    f"for {len(templates)} triggers")
+        return templates
+
+    def spot(self, samples, rate: int = RATE) -> tuple:
+        """(trigger or None, best distance) for one isolated word."""
+        np = self._np
+        if rate != self.RATE:
+            n_out   = int(len(samples) * self.RATE / rate)
+            samples = np.interp(np.linspace(0, len(samples) - 1, n_out),
+                                np.arange(len(samples)), samples)
+        feats = self.features(self._trim(samples))
+        best, best_dist = None, float("inf")
+        for trigger, refs in self.templates.items():
+            for ref in refs:
+                dist = self.dtw(feats, ref)
+                if dist < best_dist:
+                    best, best_dist = trigger, dist
+        return (best if best_dist <= self.max_distance else None), best_dist
+
+    # ── Streaming ─────────────────────────────
+    def feed(self, pcm: bytes, rate: int, threshold: float):
+        """
+        Segment the capture stream: blocks louder than `threshold` open a
+        word, GAP_SEC of quieter blocks close it.  Words longer than
+        max_word_sec are sentences and are not spotted.
+        """
+        np = self._np
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if not samples.size:
+            return
+        seconds = samples.size / rate
+        x = samples.astype(np.float32)
+        voiced = float(np.sqrt(np.mean(x * x))) >= threshold
+
+        if not self._active:
+            if voiced:
+                self._active, self._length, self._silent = True, seconds, 0.0
+                self._blocks = [samples] if self._pre is None else [self._pre, samples]
+            else:
+                self._pre = samples
+            return
+
+        self._silent = 0.0 if voiced else self._silent + seconds
+        if self._blocks is not None:
+            self._blocks.append(samples)
+            self._length += seconds
+            if self._length > self.max_word_sec + self.GAP_SEC:
+                self._blocks = None
+        if self._silent >= self.GAP_SEC:
+            if self._blocks is not None and self._length - self._silent >= self.MIN_SEC:
+                word = np.concatenate(self._blocks)[:-int(self._silent * rate) or None]
+                try:
+                    self._queue.put_nowait((time.perf_counter(), word, rate))
+                except queue.Full:
+                    pass
+            self._active, self._blocks, self._pre = False, None, samples
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            ended_at, word, rate = item
+            picked_at = time.perf_counter()
+            try:
+                trigger, dist = self.spot(word, rate)
+            except Exception as e:
+                logger.warning(f"Keyword spotting: {e}")
+                continue
+            if trigger is None:
+                self.rejected += 1
+                continue
+            self.spotted += 1
+            self.latencies.append(time.perf_counter() - ended_at)
+            self._fired[trigger] = time.time()
+            if self.on_spot:
+                self.on_spot(trigger, dist, ended_at, picked_at)
+
+    def claimed(self, trigger: str) -> bool:
+        """True if `trigger` was spotted recently (the full backend must not fire it again)."""
+        return time.time() - self._fired.get(trigger, 0) < self.HOLD_SEC
+
+    def close(self):
+        self._queue.put(None)
+
+    def summary(self) -> dict:
+        values = sorted(self.latencies)
+        out = {"triggers": len(self.templates), "spotted": self.spotted,
+               "rejected": self.rejected}
+        if values:
+            out["p50_ms"] = round(values[int(0.50 * (len(values) - 1))] * 1000, 1)
+            out["p95_ms"] = round(values[int(0.95 * (len(values) - 1))] * 1000, 1)
+        return out
+
+
+# ──────────────────────────────────────────────
+# Hybrid backend statistics
+# ──────────────────────────────────────────────
+class BackendStats:
+    """Rolling latency, trigger hit-rate and race wins for one backend."""
+
+    def __init__(self, window: int = 50):
+        self.latencies: deque = deque(maxlen=window)
+        self.hits:      deque = deque(maxlen=window)
+        self.wins:      deque = deque(maxlen=window)
+        self.skipped = 0
+
+    def record(self, latency: float, hit: bool):
+        self.latencies.append(latency)
+        self.hits.append(hit)
+
+    @property
+    def mean_latency(self) -> float:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return sum(self.hits) / len(self.hits) if self.hits else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return sum(self.wins) / len(self.wins) if self.wins else 1.0
+
+    def losing(self, threshold: float) -> bool:
+        """True once a full window of decided races has been (almost) always lost."""
+        return len(self.wins) == self.wins.maxlen and self.win_rate < threshold
+
+    def summary(self) -> str:
+        return (f"{self.mean_latency * 1000:.0f} ms, hits {self.hit_rate:.0%}, "
+                f"wins {self.win_rate:.0%}, skipped {self.skipped}")
+
+
+# ──────────────────────────────────────────────
+# Latency tracing
+# ──────────────────────────────────────────────
+TRACE_STAGES = ("capture_end", "recog_start", "recog_end", "match", "dispatch", "play_start")
+
+# Span name → (from stage, to stage)
+TRACE_SPANS = {
+    "queue":     ("capture_end", "recog_start"),
+    "recognize": ("recog_start", "recog_end"),
+    "match":     ("recog_end",   "match"),
+    "dispatch":  ("match",       "dispatch"),
+    "playback":  ("dispatch",    "play_start"),
+    "total":     ("capture_end", "play_start"),
+}
+
+
+class UtteranceTrace:
+    """perf_counter() timestamps of one utterance through the pipeline."""
+
+    __slots__ = ("wall", "backend", "settings", "text", "trigger", "t")
+
+    def __init__(self, backend: str, settings: dict):
+        self.wall     = time.time()
+        self.backend  = backend
+        self.settings = settings
+        self.text     = ""
+        self.trigger  = ""
+        self.t: dict[str, float] = {}
+
+    def mark(self, stage: str, at: float | None = None):
+        self.t[stage] = time.perf_counter() if at is None else at
+
+    def span(self, name: str) -> float | None:
+        start, end = TRACE_SPANS[name]
+        if start in self.t and end in self.t:
+            return self.t[end] - self.t[start]
+        return None
+
+    def as_row(self) -> dict:
+        row = {
+            "time":    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.wall)),
+            "backend": self.backend,
+            "text":    self.text,
+            "trigger": self.trigger,
+        }
+        for name in TRACE_SPANS:
+            ms = self.span(name)
+            row[f"{name}_ms"] = round(ms * 1000, 1) if ms is not None else ""
+        row.update(self.settings)
+        return row
+
+
+class TraceRecorder:
+    """Fixed-size ring of the most recent utterance traces."""
+
+    def __init__(self, size: int = 1000):
+        self._ring: deque = deque(maxlen=size)
+
+    def __len__(self):
+        return len(self._ring)
+
+    def add(self, trace: UtteranceTrace):
+        self._ring.append(trace)
+
+    def percentiles(self) -> dict:
+        """Span name → (p50 ms, p95 ms, samples), spans with no data omitted."""
+        traces = list(self._ring)
+        stats = {}
+        for name in TRACE_SPANS:
+            values = sorted(v for v in (t.span(name) for t in traces) if v is not None)
+            if values:
+                p50 = values[int(0.50 * (len(values) - 1))]
+                p95 = values[int(0.95 * (len(values) - 1))]
+                stats[name] = (p50 * 1000, p95 * 1000, len(values))
+        return stats
+
+    def export(self, path: str) -> int:
+        """Write the ring to .json or .csv (by extension); return row count."""
+        rows = [t.as_row() for t in list(self._ring)]
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+        else:
+            import csv
+            fields = list(rows[0]) if rows else ["time"]
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        return len(rows)
+
+
+# ──────────────────────────────────────────────
+# Command history (SQLite)
+# ──────────────────────────────────────────────
+class HistoryStore:
+    """
+    Every fired command, persisted to SQLite in WAL mode.
+
+    record() only enqueues: a writer thread commits whatever has piled up in
+    one transaction, and keeps the per trigger / hour / backend counters in
+    step so the aggregates are read without scanning the history table.
+    Readers (GUI pages, daemon endpoints) share one connection; WAL lets them
+    run while the writer commits.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            id      INTEGER PRIMARY KEY,
+            ts      REAL NOT NULL,
+            trigger TEXT NOT NULL,
+            kind    TEXT NOT NULL,
+            backend TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS agg_trigger (
+            trigger TEXT PRIMARY KEY, n INTEGER NOT NULL, last_ts REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS agg_hour (
+            hour INTEGER PRIMARY KEY, n INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS agg_backend (
+            backend TEXT PRIMARY KEY, n INTEGER NOT NULL);
+    """
+
+    def __init__(self, path: str):
+        self.path   = path
+        self._queue: queue.Queue = queue.Queue()
+        writer = self._connect()
+        writer.executescript(self._SCHEMA)
+        self._reader = self._connect()
+        self._read_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, args=(writer,),
+                                        daemon=True, name="EAR-history")
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ── Writer ────────────────────────────────
+    def record(self, trigger: str, kind: str, backend: str, ts: float | None = None):
+        self._queue.put((ts or time.time(), trigger, kind, backend))
+
+    def _run(self, conn: sqlite3.Connection):
+        while True:
+            rows = [self._queue.get()]
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in rows
+            rows = [r for r in rows if r is not None]
+            try:
+                with conn:
+                    self._write(conn, rows)
+            except sqlite3.Error as e:
+                logger.error(f"History write failed: {e}")
+            if stop:
+                conn.close()
+                return
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, rows: list):
+        conn.executemany(
+            "INSERT INTO history (ts, trigger, kind, backend) VALUES (?, ?, ?, ?)", rows)
+        conn.executemany(
+            "INSERT INTO agg_trigger VALUES (?, 1, ?) ON CONFLICT(trigger) "
+            "DO UPDATE SET n = n + 1, last_ts = excluded.last_ts",
+            [(trigger, ts) for ts, trigger, _, _ in rows])
+        conn.executemany(
+            "INSERT INTO agg_hour VALUES (?, 1) ON CONFLICT(hour) DO UPDATE SET n = n + 1",
+            [(time.localtime(ts).tm_hour,) for ts, *_ in rows])
+        conn.executemany(
+            "INSERT INTO agg_backend VALUES (?, 1) ON CONFLICT(backend) DO UPDATE SET n = n + 1",
+            [(backend,) for *_, backend in rows])
+
+    def close(self):
+        """Flush pending rows and stop the writer."""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        with self._read_lock:
+            self._reader.close()
+
+    # ── Readers ───────────────────────────────
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM history")[0][0]
+
+    def page(self, offset: int = 0, limit: int = 100) -> list:
+        """(ts, trigger, kind, backend) rows, newest first."""
+        return self._query("SELECT ts, trigger, kind, backend FROM history "
+                           "ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
+
+    def top_triggers(self, limit: int = 20) -> list:
+        """(trigger, count, last ts), most fired first."""
+        return self._query("SELECT trigger, n, last_ts FROM agg_trigger "
+                           "ORDER BY n DESC LIMIT ?", (limit,))
+
+    def by_hour(self) -> dict:
+        return dict(self._query("SELECT hour, n FROM agg_hour ORDER BY hour"))
+
+    def by_backend(self) -> dict:
+        return dict(self._query("SELECT backend, n FROM agg_backend ORDER BY n DESC"))
+
+
+# ──────────────────────────────────────────────
+# File watcher (hot reload)
+# ──────────────────────────────────────────────
+class FileWatcher:
+    """
+    Polls the mtime/size of a few files and calls the matching handler once
+    a change has settled (same stamp on two consecutive polls), so a file
+    still being written by an editor is not loaded half-way.
+    """
+
+    def __init__(self, handlers: dict, interval: float = 1.0, on_error=None):
+        self._handlers = handlers
+        self.interval  = interval
+        self.on_error  = on_error
+        self._stamps   = {path: self._stamp(path) for path in handlers}
+        self._pending: dict[str, tuple] = {}
+        self._stop     = threading.Event()
+        self._thread   = threading.Thread(target=self._run, daemon=True, name="EAR-watch")
+
+    @staticmethod
+    def _stamp(path: str) -> tuple | None:
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for path, handler in self._handlers.items():
+                stamp = self._stamp(path)
+                if stamp == self._stamps[path]:
+                    self._pending.pop(path, None)
+                    continue
+                if self._pending.get(path) != stamp:
+                    self._pending[path] = stamp      # changed: wait one more poll
+                    continue
+                del self._pending[path]
+                self._stamps[path] = stamp
+                logger.info(f"{path} changed — reloading")
+                try:
+                    handler()
+                except Exception as e:
+                    if self.on_error:
+                        self.on_error(f"Auto-reload of {path} failed: {e}")
 
 
 # ──────────────────────────────────────────────
@@ -209,15 +1932,37 @@ class VoskBackend:
 # ──────────────────────────────────────────────
 class AudioCommandRecognizer:
 
-    def __init__(self):
-        self.cfg = load_config()
+    def __init__(self, cfg: configparser.ConfigParser | None = None):
+        self.startup: dict[str, float] = {}     # stage → ms since import
+        self.cfg = cfg or load_config()
         self._apply_config()
-
-        pygame.mixer.init()
-
-        self.commands       = load_keywords()
-        self.system_actions = load_actions()
+        self._reload_lock = threading.Lock()
+
+        # Mixer, speech backend and sound bank are loaded by _load() on a
+        # background thread so the window shows up at once; playback and the
+        # listen loop wait for the events below.
+        self._vosk = self._sr = self._rec = self._mic = self._vad = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._spotter: KeywordSpotter | None = None
+        self.hybrid_stats: dict[str, BackendStats] = {}
+        self._noise = NoiseFloor(self.energy_thresh, *self._noise_settings)
+        self._audio_ready = threading.Event()
+        self._ready       = threading.Event()
+        self.load_state   = "Starting"
+        self.load_error: str | None = None
+        self._bank = SoundBank(self.sound_bank_mb, self.stream_above_mb)
+        self._player = PlaybackWorker(self._bank,
+                                      on_start=self._on_playback_start,
+                                      on_error=self._notify_error,
+                                      ready=self._audio_ready)
+
+        self._launcher = ActionLauncher(on_launched=self._on_launched,
+                                        on_error=self._notify_error)
+        self._missing_sounds: set | None = None
+        self._load_tables()
+        self.traces = TraceRecorder(self.trace_size)
         self._last_triggered: dict[str, float] = {}
+        self.history = HistoryStore(self.history_db) if self.history_db else None
 
         Path(SOUNDS_DIR).mkdir(exist_ok=True)
         self.is_listening  = False
@@ -231,54 +1976,367 @@ class AudioCommandRecognizer:
         self.on_listening_stop   = None
         self.on_word_heard       = None
 
-    def _apply_config(self):
-        rec = self.cfg["recognition"]
-        aud = self.cfg["audio"]
-        cmd = self.cfg["commands"]
-        net = self.cfg["network"]
-
-        self.backend       = rec.get("backend", "google").lower()
-        self.language      = rec.get("language", "fr-FR")
-        self.pause_thresh  = float(rec.get("pause_threshold",   "0.5"))
-        self.phrase_limit  = float(rec.get("phrase_time_limit", "3"))
-        self.listen_timeout= float(rec.get("listen_timeout",    "0.5"))
-        self.energy_thresh = int(aud.get("energy_threshold", "300"))
-        self.dynamic_energy= aud.get("dynamic_energy", "false").lower() == "true"
-        self.cooldown_sec  = float(cmd.get("cooldown_sec",  "2.0"))
-        self.log_max_lines = int(cmd.get("log_max_lines", "500"))
-        self.max_retry     = int(net.get("max_retry",       "5"))
-        self.retry_delay   = int(net.get("retry_delay_sec", "3"))
+        # Hot reload: the watcher calls the same reload_* methods as the GUI
+        self._watcher = None
+        if self.watch_interval > 0:
+            self._watcher = FileWatcher({
+                KEYWORDS_FILE: self.reload_keywords,
+                ACTIONS_FILE:  self.reload_actions,
+                CONFIG_FILE:   self.reload_config,
+            }, self.watch_interval, on_error=self._notify_error)
+            self._watcher.start()
+
+        self.mark_startup("engine")
+        threading.Thread(target=self._load, daemon=True, name="EAR-load").start()
+
+    # ── Background start-up ───────────────────
+    def _load(self):
+        """Open the audio output, then the speech backend, then decode sounds."""
+        audio_ok = False
+        try:
+            self.load_state = "Starting audio output"
+            import pygame
+            pygame.mixer.pre_init(buffer=self.mixer_buffer)
+            pygame.mixer.init()
+            audio_ok = True
+            self._audio_ready.set()
+            self.mark_startup("audio")
+
+            self.load_state = ("Loading Vosk model" if self.backend in ("vosk", "hybrid")
+                               else "Opening microphone")
+            # The model loads outside the lock so reloads are not held up;
+            # the lock is only taken to publish it.
+            key     = self._backend_key()
+            backend = self._build_backend()
+            with self._reload_lock:
+                if self._backend_key() == key:    # else a reload already built the new one
+                    self._publish_backend(backend)
+                    if self._vosk:
+                        self._vosk.set_grammar(self._matcher.triggers() if self.vosk_grammar
+                                               else None)
+                self._init_spotter()
+            self.mark_startup("backend")
+            self.load_state = "ready"
+        except Exception as e:
+            self.load_error = str(e)
+            self.load_state = f"failed: {e}"
+            logger.error(f"Start-up failed: {e}")
+        finally:
+            self._audio_ready.set()
+            self._ready.set()
+
+        # Sounds play even if the recognizer failed (e.g. the GUI test button);
+        # those not decoded yet are decoded on first play meanwhile
+        if audio_ok:
+            self._fill_sound_bank()
+            self.mark_startup("sounds")
+        self._report_actions()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until start-up has finished; False if it failed or timed out."""
+        return self._ready.wait(timeout) and self.load_error is None
+
+    def mark_startup(self, stage: str):
+        """Record when `stage` was first reached (ms since ear.py was imported)."""
+        if stage in self.startup:
+            return
+        self.startup[stage] = (time.perf_counter() - _STARTED) * 1000
+        if stage == "first_listen":
+            logger.info("Start-up timing: " + ", ".join(
+                f"{name} {ms:.0f} ms" for name, ms in self.startup.items()))
 
-        if self.backend == "vosk":
-            model_path  = rec.get("vosk_model_path", "models/vosk-model-small-fr-0.22")
-            self._vosk  = VoskBackend(model_path)
-            self._sr    = None
-            self._rec   = None
-            self._mic   = None
-        else:
+    def _apply_config(self):
+        """Read every setting from self.cfg into attributes."""
+        vars(self).update(vars(self._read_config(self.cfg)))
+
+    @staticmethod
+    def _read_config(cfg: configparser.ConfigParser) -> types.SimpleNamespace:
+        """Parse every setting of `cfg`; raises on a bad value before anything is applied."""
+        s   = types.SimpleNamespace()
+        rec = cfg["recognition"]
+        aud = cfg["audio"]
+        cmd = cfg["commands"]
+        net = cfg["network"]
+
+        s.backend       = rec.get("backend", "google").lower()
+        s.language      = rec.get("language", "fr-FR")
+        s.vosk_model_path = rec.get("vosk_model_path", "models/vosk-model-small-fr-0.22")
+        s.pause_thresh  = float(rec.get("pause_threshold",   "0.5"))
+        s.phrase_limit  = float(rec.get("phrase_time_limit", "3"))
+        s.listen_timeout= float(rec.get("listen_timeout",    "0.5"))
+        s.energy_thresh = int(aud.get("energy_threshold", "300"))
+        s.dynamic_energy= aud.get("dynamic_energy", "false").lower() == "true"
+        s.mixer_buffer  = int(aud.get("mixer_buffer", "512"))
+        s.sound_bank_mb = float(aud.get("sound_bank_mb",   "64"))
+        s.stream_above_mb = float(aud.get("stream_above_mb", "2"))
+        s.playback_preempt = aud.get("playback_preempt", "true").lower() == "true"
+        s.echo_gate_factor = float(aud.get("echo_gate_factor", "3.0"))
+        s.echo_tail_sec    = float(aud.get("echo_tail_sec",    "0.3"))
+        s.adaptive_noise   = aud.get("adaptive_noise", "true").lower() == "true"
+        s._noise_settings  = (float(aud.get("noise_ratio",      "2.0")),
+                                 float(aud.get("noise_min",        "100")),
+                                 float(aud.get("noise_max",        "4000")),
+                                 float(aud.get("noise_window_sec", "10")),
+                                 float(aud.get("noise_hysteresis", "0.15")))
+        s.cooldown_sec  = float(cmd.get("cooldown_sec",  "2.0"))
+        s.log_max_lines = int(cmd.get("log_max_lines", "500"))
+        s.trace_size    = int(cmd.get("trace_size",    "1000"))
+        s.watch_interval = float(cmd.get("watch_interval_sec", "1.0"))
+        s.word_boundaries = cmd.get("word_boundaries", "false").lower() == "true"
+        s.fuzzy            = cmd.get("fuzzy", "false").lower() == "true"
+        s.fuzzy_max_ratio  = float(cmd.get("fuzzy_max_ratio", "0.25"))
+        s.fuzzy_min_length = int(cmd.get("fuzzy_min_length",  "5"))
+        s.history_db       = cmd.get("history_db", "history.db").strip()
+        s.vosk_streaming = rec.get("vosk_streaming", "true").lower() == "true"
+        s.vosk_partial   = rec.get("vosk_partial",   "true").lower() == "true"
+        s.vosk_grammar   = rec.get("vosk_grammar",   "false").lower() == "true"
+        s.hybrid_timeout     = float(rec.get("hybrid_timeout",     "3"))
+        s.hybrid_window      = int(rec.get("hybrid_window",        "50"))
+        s.hybrid_skip_below  = float(rec.get("hybrid_skip_below",  "0.05"))
+        s.hybrid_probe_every = int(rec.get("hybrid_probe_every",   "10"))
+        s.vad_enabled        = rec.get("vad", "true").lower() == "true"
+        s.vad_min_voiced     = float(rec.get("vad_min_voiced_ratio", "0.2"))
+        s.kws_enabled        = rec.get("kws", "false").lower() == "true"
+        s.kws_templates      = rec.get("kws_templates", "kws")
+        s.kws_max_distance   = float(rec.get("kws_max_distance", "1.5"))
+        s.kws_max_word_sec   = float(rec.get("kws_max_word_sec", "1.2"))
+        s.max_retry     = int(net.get("max_retry",       "5"))
+        s.retry_delay   = int(net.get("retry_delay_sec", "3"))
+        # Copied into every trace so exports can be compared across settings
+        s._trace_settings = {
+            "pause_threshold":   s.pause_thresh,
+            "phrase_time_limit": s.phrase_limit,
+            "listen_timeout":    s.listen_timeout,
+        }
+        return s
+
+    def _backend_key(self) -> tuple:
+        """Settings that need the capture objects rebuilt when they change."""
+        return self.backend, self.vosk_model_path
+
+    def _build_backend(self, s=None) -> dict:
+        """
+        Create the microphone / recognizer / model objects for the settings
+        `s` (default: the current ones) without publishing them: loading a
+        Vosk model can take seconds.
+        """
+        s = self if s is None else s
+        objs = {"_vosk": None, "_sr": None, "_rec": None, "_mic": None, "_vad": None}
+        if s.backend in ("vosk", "hybrid"):
+            objs["_vosk"] = VoskBackend(s.vosk_model_path)
+        if s.backend != "vosk":
             import speech_recognition as sr
-            self._sr  = sr
-            self._rec = sr.Recognizer()
-            self._mic = sr.Microphone()
+            rec = sr.Recognizer()
+            rec.energy_threshold         = s.energy_thresh
+            rec.dynamic_energy_threshold = s.dynamic_energy and not s.adaptive_noise
+            rec.pause_threshold          = s.pause_thresh
+            if s.backend == "hybrid":
+                # A stalled request must not hold a race worker past the race
+                rec.operation_timeout    = s.hybrid_timeout
+            objs.update(_sr=sr, _rec=rec, _mic=sr.Microphone())
+            if s.vad_enabled:
+                try:
+                    objs["_vad"] = SpeechDetector(min_voiced_ratio=s.vad_min_voiced)
+                except ImportError as e:
+                    logger.warning(f"{e} — VAD disabled")
+        return objs
+
+    def _publish_backend(self, objs: dict):
+        """Swap in objects from _build_backend(); the caller holds _reload_lock."""
+        for name, obj in objs.items():
+            setattr(self, name, obj)
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self.backend == "hybrid":
+            self._pool  = ThreadPoolExecutor(max_workers=4, thread_name_prefix="EAR-hybrid")
+            self.hybrid_stats = {name: BackendStats(self.hybrid_window)
+                                 for name in ("vosk", "google")}
+            self._race_count = 0
+
+    def _init_backend(self):
+        self._publish_backend(self._build_backend())
+
+    def _init_spotter(self):
+        """(Re)load the keyword-spotting templates, or drop the spotter when disabled."""
+        if self._spotter:
+            self._spotter.close()
+            self._spotter = None
+        if not self.kws_enabled:
+            return
+        try:
+            spotter = KeywordSpotter(self.kws_templates, self.kws_max_distance,
+                                     self.kws_max_word_sec, on_spot=self._on_spot)
+        except ImportError as e:
+            logger.warning(f"{e} — keyword spotting disabled")
+            return
+        for trigger in spotter.templates:
+            if trigger not in self.commands and trigger not in self.system_actions:
+                logger.warning(f'Keyword spotting: "{trigger}" is not a trigger — ignored')
+        self._spotter = spotter if spotter.templates else None
+
+    def _apply_live_settings(self):
+        """Push settings that can change under a running listen loop."""
+        self._noise.configure(*self._noise_settings)
+        if self.adaptive_noise:
+            self.energy_thresh = int(self._noise.threshold)   # keep what was learnt
+        else:
+            self._noise.threshold = self.energy_thresh
+        if self._rec:
             self._rec.energy_threshold         = self.energy_thresh
-            self._rec.dynamic_energy_threshold = self.dynamic_energy
+            self._rec.dynamic_energy_threshold = self.dynamic_energy and not self.adaptive_noise
             self._rec.pause_threshold          = self.pause_thresh
-            self._vosk = None
+            if self.backend == "hybrid":
+                self._rec.operation_timeout    = self.hybrid_timeout
+        if self._vad:
+            self._vad.min_voiced_ratio = self.vad_min_voiced
+        elif self.vad_enabled and self.backend != "vosk":
+            try:
+                self._vad = SpeechDetector(min_voiced_ratio=self.vad_min_voiced)
+            except ImportError as e:
+                logger.warning(f"{e} — VAD disabled")
+        if not self.vad_enabled:
+            self._vad = None
+        self._bank.budget       = int(self.sound_bank_mb * 1024 * 1024)
+        self._bank.stream_above = int(self.stream_above_mb * 1024 * 1024)
 
     # ── Reload helpers ────────────────────────
+    def _load_tables(self):
+        """Load keywords.txt + actions.ini through the cached TriggerIndex and publish."""
+        index = TriggerIndex.load(word_boundaries=self.word_boundaries)
+        self._missing_sounds = index.missing
+        self._rebuild_matcher(index.actions, index.commands, index.matcher)
+
+    def _rebuild_matcher(self, actions: dict | None = None, commands: dict | None = None,
+                         matcher: TriggerMatcher | None = None):
+        """
+        Compile both trigger tables into one automaton (unless `matcher` is
+        already compiled for them), then publish tables and matcher.  The
+        listen loop only ever reads self._matcher, which is replaced in a
+        single assignment once fully built.
+        """
+        actions  = self.system_actions if actions  is None else actions
+        commands = self.commands       if commands is None else commands
+        if matcher is None:
+            matcher = TriggerMatcher(actions, commands, word_boundaries=self.word_boundaries)
+        matcher.word_boundaries = self.word_boundaries
+        fuzzy    = FuzzyMatcher(actions, commands, self.fuzzy_max_ratio,
+                                self.fuzzy_min_length) if self.fuzzy else None
+        self.system_actions, self.commands = actions, commands
+        self._matcher, self._fuzzy = matcher, fuzzy
+        if self._vosk:
+            self._vosk.set_grammar(matcher.triggers() if self.vosk_grammar else None)
+
+    def _fill_sound_bank(self):
+        """Decode every sound referenced by keywords.txt; report missing ones now."""
+        if not self._audio_ready.is_set():
+            return                                # _load() fills it once the mixer is up
+        for fichier in self._bank.load(self.commands.values(), known_missing=self._missing_sounds):
+            self._notify_error(f"Audio file not found: {fichier}")
+
+    def _report_actions(self):
+        """Report actions.ini entries that resolve_action() found unusable."""
+        for trigger, info in self.system_actions.items():
+            if info.get("error"):
+                self._notify_error(f"actions.ini [{trigger}]: {info['error']}")
+
+    # A single changed file only rebuilds its own table; the other one is
+    # reused as is (the on-disk index is refreshed at the next start-up).
     def reload_keywords(self):
-        self.commands = load_keywords()
+        commands = {trigger: os.path.abspath(audio) for trigger, audio in load_keywords().items()}
+        with self._reload_lock:
+            self._missing_sounds = None        # SoundBank.load checks the new paths
+            self._rebuild_matcher(commands=commands)
+            self._fill_sound_bank()
         self._notify_word(f"keywords.txt reloaded — {len(self.commands)} commands")
 
     def reload_actions(self):
-        self.system_actions = load_actions()
+        actions = load_actions()               # resolve_action() on actions.ini only
+        with self._reload_lock:
+            self._rebuild_matcher(actions=actions)
+        self._report_actions()
         self._notify_word(f"actions.ini reloaded — {len(self.system_actions)} actions")
 
     def reload_config(self):
-        self.cfg = load_config()
-        self._apply_config()
+        """
+        Re-read config.ini.  Audio and matching settings are applied to the
+        running loop; only a change of backend or Vosk model restarts capture.
+        The file is parsed, and a new backend built, before anything changes;
+        if applying it still fails, the previous settings and backend are put
+        back and capture resumes as it was.
+        """
+        try:
+            cfg      = load_config()
+            settings = self._read_config(cfg)
+        except Exception as e:
+            self._notify_error(f"config.ini not applied: {e}")
+            return
+        with self._reload_lock:
+            restart = (settings.backend, settings.vosk_model_path) != self._backend_key()
+            try:
+                backend = self._build_backend(settings) if restart else {}
+            except Exception as e:
+                self._notify_error(f"config.ini not applied: {e}")
+                return
+
+            previous      = self.cfg, {name: getattr(self, name) for name in vars(settings)}
+            old_backend   = {name: getattr(self, name) for name in backend}
+            was_listening = self.is_listening
+            try:
+                self.cfg = cfg
+                vars(self).update(vars(settings))
+                if restart:
+                    self._stop_and_wait()
+                    self._publish_backend(backend)
+                    if was_listening:
+                        self._start_thread()
+                else:
+                    self._apply_live_settings()
+                self._rebuild_matcher(matcher=self._matcher)   # tables unchanged
+                if self._ready.is_set():
+                    self._init_spotter()
+            except Exception as e:
+                self.cfg = previous[0]
+                vars(self).update(previous[1])
+                if restart:
+                    self._stop_and_wait()
+                    self._publish_backend(old_backend)
+                else:
+                    self._apply_live_settings()
+                self._rebuild_matcher(matcher=self._matcher)
+                if was_listening and not self.is_listening:
+                    self._start_thread()
+                self._notify_error(f"config.ini not applied: {e}")
+                return
         self._notify_word("config.ini reloaded.")
 
+    def _new_trace(self) -> UtteranceTrace:
+        return UtteranceTrace(self.backend, self._trace_settings)
+
+    # ── Statistics ────────────────────────────
+    def stats(self) -> dict:
+        """Snapshot for the GUI sidebar and the daemon's /stats endpoint."""
+        vad = self._vad
+        return {
+            "listening": self.is_listening,
+            "backend":   self.backend,
+            "commands":  len(self.commands),
+            "actions":   len(self.system_actions),
+            "vad":       {"passed": vad.passed, "dropped": vad.dropped} if vad else None,
+            "latency":   {span: [round(p50, 1), round(p95, 1), n]
+                          for span, (p50, p95, n) in self.traces.percentiles().items()},
+            "hybrid":    self.hybrid_summary() if self.backend == "hybrid" else None,
+            "launch":    self._launcher.summary(),
+            "kws":       self._spotter.summary() if self._spotter else None,
+            "noise":     {"floor":     round(self._noise.floor or 0),
+                          "threshold": self.energy_thresh},
+            "loading":   self.load_state,
+            "startup":   {stage: round(ms) for stage, ms in self.startup.items()},
+        }
+
+    def export_traces(self, path: str) -> int:
+        return self.traces.export(path)
+
     # ── Notifications ─────────────────────────
     def _notify_word(self, msg: str):
         if self.on_word_heard:
@@ -314,126 +2372,151 @@ class AudioCommandRecognizer:
 
     # ── Calibration ───────────────────────────
     def calibrer_micro(self):
-        """Adjust energy_threshold to current ambient noise.
-        Stops the listen loop first so the mic is free."""
-        if self.backend == "vosk":
-            self._notify_word("Calibration not needed for Vosk backend.")
+        """Set energy_threshold to the current noise-floor target, at once."""
+        target = self._noise.snap()
+        if target is None:
+            self._notify_word("No noise estimate yet — keep EAR listening for a few seconds.")
             return
-
-        was_listening = self.is_listening
-        self._stop_and_wait()
-
-        try:
-            self._notify_word("Calibrating audio… please stay quiet.")
-            with self._mic as source:
-                self._rec.adjust_for_ambient_noise(source, duration=2)
-            self.energy_thresh = int(self._rec.energy_threshold)
-            self._notify_word(f"Calibration complete. Threshold: {self.energy_thresh}")
-        except Exception as e:
-            self._notify_error(f"Calibration error: {e}")
-        finally:
-            if was_listening:
-                self._start_thread()
+        self._set_threshold(target)
+        self._notify_word(f"Calibration complete. Threshold: {self.energy_thresh} "
+                          f"(noise floor {self._noise.floor:.0f})")
 
     def measure_threshold(self) -> int | None:
         """
-        Measure ambient noise for 3 s and report the suggested energy_threshold.
+        Report the suggested energy_threshold from the rolling noise floor.
         Does not change the current value — copy it to config.ini manually.
         """
-        if self.backend == "vosk":
-            self._notify_word("Threshold measurement not available for Vosk backend.")
+        target = self._noise.target()
+        if target is None:
+            self._notify_word("No noise estimate yet — keep EAR listening for a few seconds.")
             return None
+        measured = int(target)
+        self._notify_word(
+            f"Measured: {measured}  (current: {self.energy_thresh}, "
+            f"noise floor {self._noise.floor:.0f})  "
+            f"— set energy_threshold = {measured} in config.ini to lock this in."
+        )
+        return measured
 
-        was_listening = self.is_listening
-        self._stop_and_wait()
+    def _set_threshold(self, value: float):
+        self.energy_thresh = int(value)
+        if self._rec:
+            self._rec.energy_threshold = self.energy_thresh
 
-        try:
-            import speech_recognition as sr
-            self._notify_word("Measuring ambient noise… stay quiet for 3 s.")
-            r = sr.Recognizer()
-            with self._mic as source:
-                r.adjust_for_ambient_noise(source, duration=3)
-            measured = int(r.energy_threshold)
-            self._notify_word(
-                f"Measured: {measured}  (current: {self.energy_thresh})  "
-                f"— set energy_threshold = {measured} in config.ini to lock this in."
-            )
-            return measured
-        except Exception as e:
-            self._notify_error(f"Threshold measurement error: {e}")
-            return None
-        finally:
-            if was_listening:
-                self._start_thread()
+    def _on_level(self, rms: float, seconds: float):
+        """Feed the noise floor from the capture path (not while our own sounds play)."""
+        if self._echo_gate():
+            return
+        threshold = self._noise.feed(rms, seconds)
+        if threshold is not None and self.adaptive_noise:
+            self._set_threshold(threshold)
+
+    def _on_mic_chunk(self, data: bytes):
+        # Plain array, not numpy: the Google backend must not depend on it
+        samples = array("h", data[:len(data) & ~1])
+        if samples:
+            rms = math.sqrt(sum(s * s for s in samples) / len(samples))
+            self._on_level(rms, len(samples) / self._mic.SAMPLE_RATE)
+        self._spot_tap(data, self._mic.SAMPLE_RATE)
+
+    # ── Keyword spotting ──────────────────────
+    def _spot_tap(self, data: bytes, rate: int = VoskBackend.SAMPLERATE):
+        """Pass one captured block to the spotter (voices over our own sounds only)."""
+        spotter = self._spotter
+        if spotter:
+            spotter.feed(data, rate, max(self.energy_thresh, self._echo_gate()))
+
+    def _on_spot(self, trigger: str, distance: float, ended_at: float, picked_at: float):
+        """A template matched: dispatch now, without waiting for the full backend."""
+        audio_file  = self.commands.get(trigger)
+        action_info = self.system_actions.get(trigger)
+        if not self.is_listening or not (audio_file or action_info):
+            return
+        trace = UtteranceTrace("kws", self._trace_settings)
+        trace.mark("capture_end", ended_at)
+        trace.mark("recog_start", picked_at)
+        trace.mark("recog_end")
+        trace.mark("match")
+        trace.text = trace.trigger = trigger
+        self.traces.add(trace)
+        self._notify_word(f'Spotted: "{trigger}" (distance {distance:.2f})')
+        self.traiter_commande(trigger, audio_file, action_info, trace)
 
     # ── Audio ─────────────────────────────────
-    def jouer_audio(self, fichier: str):
-        try:
-            if os.path.exists(fichier):
-                if self.on_audio_playing:
-                    self.on_audio_playing(fichier)
-                self._notify_word(f"Playing: {os.path.basename(fichier)}")
-                pygame.mixer.music.load(fichier)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-            else:
-                self._notify_error(f"Audio file not found: {fichier}")
-        except Exception as e:
-            self._notify_error(f"Audio playback error: {e}")
+    def jouer_audio(self, fichier: str, priority: int = 0, trace=None):
+        """Queue a sound on the playback worker and return immediately."""
+        if os.path.exists(fichier):
+            self._player.play(fichier, priority, preempt=self.playback_preempt, trace=trace)
+        else:
+            self._notify_error(f"Audio file not found: {fichier}")
+
+    def arreter_audio(self):
+        self._player.stop()
+
+    def _on_playback_start(self, fichier: str):
+        if self.on_audio_playing:
+            self.on_audio_playing(fichier)
+        self._notify_word(f"Playing: {os.path.basename(fichier)}")
+
+    def _echo_gate(self) -> float:
+        """
+        Energy level speech must exceed while our own speakers are playing
+        (and for echo_tail_sec after), 0 when the gate is open.
+        """
+        player = self._player
+        if player.is_playing or time.time() - player.last_stop < self.echo_tail_sec:
+            return self.energy_thresh * self.echo_gate_factor
+        return 0
 
     # ── File / app launchers ──────────────────
     def ouvrir_fichier(self, chemin: str) -> bool:
-        try:
-            p = chemin if os.path.isabs(chemin) else os.path.abspath(chemin)
-            if not os.path.exists(p):
-                self._notify_error(f"File not found: {p}")
-                return False
-            system = platform.system().lower()
-            if system == "windows":
-                subprocess.Popen(f'start "" "{p}"', shell=True)
-            elif system == "darwin":
-                subprocess.Popen(["open", p])
-            else:
-                subprocess.Popen(["xdg-open", p])
-            self._notify_word(f"File opened: {os.path.basename(p)}")
-            return True
-        except Exception as e:
-            self._notify_error(f"Error opening file: {e}")
-            return False
+        return self.executer_action_systeme(
+            resolve_action({"type": "file", "path": chemin, "action": "open_file"}))
 
     def lancer_programme(self, commande: str) -> bool:
-        try:
-            subprocess.Popen(commande, shell=True)
-            self._notify_word(f"App launched: {commande}")
-            return True
-        except Exception as e:
-            self._notify_error(f"Error launching app: {e}")
-            return False
+        return self.executer_action_systeme(resolve_action(
+            {"type": "app", "action": "launch_app",
+             "command": {platform.system().lower(): commande}}))
 
     def executer_action_systeme(self, action_info: dict) -> bool:
-        if action_info["action"] == "open_file" and action_info["type"] == "file":
-            return self.ouvrir_fichier(action_info["path"])
-        elif action_info["action"] == "launch_app" and action_info["type"] == "app":
-            cmd = action_info["command"].get(platform.system().lower(), "")
-            if cmd:
-                return self.lancer_programme(cmd)
-            self._notify_error(f"No command for platform: {platform.system()}")
-        return False
+        """Hand a pre-resolved action to the launcher thread; False if it cannot work."""
+        # A path that failed at load time (e.g. a share not mounted yet) may
+        # exist now: check again before refusing.
+        if action_info.get("error") and resolve_action(action_info)["error"]:
+            self._notify_error(f"Cannot run action: {action_info['error']}")
+            return False
+        self._launcher.submit(action_info)
+        return True
+
+    def _on_launched(self, action_info: dict, elapsed: float):
+        verb = "File opened" if action_info["type"] == "file" else "App launched"
+        self._notify_word(f"{verb}: {action_label(action_info)} ({elapsed * 1000:.0f} ms)")
 
     # ── Text matching ─────────────────────────
-    def _match(self, texte: str) -> tuple:
-        self._notify_word(f'Detected: "{texte}"')
-        for trigger, info in self.system_actions.items():
-            if trigger in texte:
-                return trigger, None, info
-        for trigger, audio in self.commands.items():
-            if trigger in texte:
-                return trigger, audio, None
-        return None, None, None
+    def _match(self, texte: str, trace=None, tag: str = "") -> tuple:
+        self._notify_word(f'Detected{tag}: "{texte}"')
+        result = self._matcher.search(texte)
+        fuzzy  = self._fuzzy
+        if result[0] is None and fuzzy:
+            trigger, audio_file, action_info, score = fuzzy.search(texte)
+            if trigger:
+                logger.info(f'Fuzzy match: "{texte}" → "{trigger}" (score {score:.2f})')
+                self._notify_word(f'Fuzzy match: "{trigger}" (score {score:.2f})')
+                result = trigger, audio_file, action_info
+        if trace:
+            trace.mark("match")
+            trace.text    = texte
+            trace.trigger = result[0] or ""
+            self.traces.add(trace)
+        return result
 
     # ── Command dispatch ──────────────────────
-    def traiter_commande(self, trigger: str, audio_file, action_info):
+    def traiter_commande(self, trigger: str, audio_file, action_info, trace=None):
+        if trace:
+            trace.mark("dispatch")
+        spotter = self._spotter
+        if spotter and (trace is None or trace.backend != "kws") and spotter.claimed(trigger):
+            return                                 # already fired by the keyword spotter
         if trigger == "stop":
             self.is_listening = False
             return
@@ -441,21 +2524,33 @@ class AudioCommandRecognizer:
             logger.debug(f"Cooldown active: {trigger}")
             return
         self._mark(trigger)
+        if self.history:
+            kind = ("File" if action_info.get("type") == "file" else "App") \
+                if action_info else "Audio"
+            self.history.record(trigger, kind, trace.backend if trace else self.backend)
         if action_info:
             if self.on_command_detected:
                 self.on_command_detected(trigger, None, action_info)
             success = self.executer_action_systeme(action_info)
             if success and trigger in self.commands:
-                self.jouer_audio(self.commands[trigger])
+                self.jouer_audio(self.commands[trigger], priority=1, trace=trace)
         elif trigger and audio_file:
             if self.on_command_detected:
                 self.on_command_detected(trigger, audio_file, None)
-            self.jouer_audio(audio_file)
+            self.jouer_audio(audio_file, trace=trace)
 
     # ── Listen loop ───────────────────────────
     def ecouter_et_repondre(self):
+        while not self._ready.wait(0.1):        # backend still loading
+            if not self.is_listening:
+                return
+        if self.load_error:
+            self.is_listening = False
+            self._notify_error(f"Cannot start listening: {self.load_error}")
+            return
         if self.on_listening_start:
             self.on_listening_start()
+        self.mark_startup("first_listen")
         if self.backend == "vosk":
             self._loop_vosk()
         else:
@@ -465,25 +2560,46 @@ class AudioCommandRecognizer:
 
     def _loop_google(self):
         net_errors = 0
+        base_threshold = None
         with self._mic as source:
+            source.stream = _MicTap(source.stream, self._on_mic_chunk)
             while self.is_listening:
                 try:
-                    if pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
-                        continue
+                    # Echo gate: keep listening while a sound plays, but only
+                    # to voices louder than our own speakers
+                    level = self._echo_gate()
+                    if level and base_threshold is None:
+                        base_threshold = self._rec.energy_threshold
+                        self._rec.energy_threshold = max(base_threshold, level)
+                    elif not level and base_threshold is not None:
+                        self._rec.energy_threshold = (self.energy_thresh if self.adaptive_noise
+                                                      else base_threshold)
+                        base_threshold = None
                     audio = self._rec.listen(
                         source,
                         timeout=self.listen_timeout,
                         phrase_time_limit=self.phrase_limit,
                     )
-                    try:
-                        texte = self._rec.recognize_google(audio, language=self.language).lower()
-                    except self._sr.UnknownValueError:
+                    trace = self._new_trace()
+                    trace.mark("capture_end")
+                    if self._vad and not self._vad.is_speech(
+                        audio.get_raw_data(convert_width=2), audio.sample_rate,
+                        self._rec.energy_threshold,
+                    ):
                         continue
-                    net_errors = 0
-                    trigger, audio_file, action_info = self._match(texte)
+                    trace.mark("recog_start")
+                    if self.backend == "hybrid":
+                        trigger, audio_file, action_info = self._race(audio, trace)
+                    else:
+                        try:
+                            texte = self._rec.recognize_google(audio, language=self.language).lower()
+                        except self._sr.UnknownValueError:
+                            continue
+                        trace.mark("recog_end")
+                        net_errors = 0
+                        trigger, audio_file, action_info = self._match(texte, trace)
                     if trigger:
-                        self.traiter_commande(trigger, audio_file, action_info)
+                        self.traiter_commande(trigger, audio_file, action_info, trace)
 
                 except self._sr.WaitTimeoutError:
                     continue
@@ -505,6 +2621,7 @@ class AudioCommandRecognizer:
                         import speech_recognition as sr
                         self._mic = sr.Microphone()
                         source = self._mic.__enter__()
+                        source.stream = _MicTap(source.stream, self._on_mic_chunk)
                         self._notify_word("Microphone reconnected.")
                     except Exception as re:
                         self._notify_error(f"Microphone reconnection failed: {re}")
@@ -513,23 +2630,148 @@ class AudioCommandRecognizer:
                     self._notify_error(f"Unexpected error: {e}")
                     time.sleep(0.5)
 
+    # ── Hybrid race ───────────────────────────
+    def _timed(self, name: str, recognize, audio) -> tuple:
+        """Run one backend; record its latency and whether it hit a trigger exactly."""
+        t0 = time.perf_counter()
+        try:
+            texte = recognize(audio)
+        except (self._sr.UnknownValueError, self._sr.RequestError) as e:
+            logger.debug(f"hybrid/{name}: {type(e).__name__}")
+            texte = None
+        except Exception as e:
+            logger.warning(f"hybrid/{name}: {e}")
+            texte = None
+        texte = texte.lower() if texte else None
+        match = self._matcher.search(texte) if texte else (None, None, None)
+        self.hybrid_stats[name].record(time.perf_counter() - t0, match[0] is not None)
+        return name, texte, match
+
+    def _race(self, audio, trace=None) -> tuple:
+        """
+        Send one captured phrase to Vosk and Google at once and act on the
+        first answer that matches a trigger; the slower one is ignored.
+        The chosen text then goes through _match like any other backend, so
+        the fuzzy fallback applies when neither matched exactly.  A backend
+        that keeps losing is skipped, except for an occasional probe so it
+        can win its place back.
+        """
+        self._race_count += 1
+        probe = self._race_count % self.hybrid_probe_every == 0
+        runners = {
+            "vosk":   lambda a: self._vosk.recognize(
+                          a.get_raw_data(convert_rate=VoskBackend.SAMPLERATE, convert_width=2)),
+            "google": lambda a: self._rec.recognize_google(a, language=self.language),
+        }
+        # Only ever skip the weaker backend: the one with the better race
+        # record (then the lower latency) always runs.
+        best = max(runners, key=lambda n: (self.hybrid_stats[n].win_rate,
+                                           -self.hybrid_stats[n].mean_latency))
+        for name in list(runners):
+            stats = self.hybrid_stats[name]
+            if name != best and not probe and stats.losing(self.hybrid_skip_below):
+                stats.skipped += 1
+                del runners[name]
+
+        futures = [self._pool.submit(self._timed, name, fn, audio) for name, fn in runners.items()]
+        heard, winner = None, None
+        try:
+            for fut in as_completed(futures, timeout=self.hybrid_timeout):
+                name, texte, match = fut.result()
+                heard = heard or texte
+                if match[0]:
+                    winner, heard = name, texte
+                    break
+        except FutureTimeout:
+            logger.debug("hybrid: race timed out")
+
+        # A phrase no backend matched is not a race: most of what a room says
+        # is not a command, and counting those as losses would sink both.
+        if len(runners) > 1 and winner:
+            for name in runners:
+                self.hybrid_stats[name].wins.append(name == winner)
+        if not heard:
+            return None, None, None
+        if trace:
+            trace.mark("recog_end")
+            trace.backend = f"hybrid/{winner or '-'}"
+        return self._match(heard, trace, tag=f" [{winner}]" if winner else "")
+
+    def hybrid_summary(self) -> str:
+        return "  |  ".join(f"{name}: {stats.summary()}"
+                            for name, stats in self.hybrid_stats.items())
+
     def _loop_vosk(self):
+        if self.vosk_streaming:
+            self._loop_vosk_stream()
+            return
         while self.is_listening:
             try:
-                if pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                    continue
-                texte = self._vosk.listen_once(self.phrase_limit)
+                texte = self._vosk.listen_once(self.phrase_limit, gate=self._echo_gate,
+                                               on_level=self._on_level, tap=self._spot_tap)
                 if texte:
-                    trigger, audio_file, action_info = self._match(texte)
+                    # Capture and decoding are interleaved here: one timestamp
+                    trace = self._new_trace()
+                    for stage in ("capture_end", "recog_start", "recog_end"):
+                        trace.mark(stage)
+                    trigger, audio_file, action_info = self._match(texte, trace)
                     if trigger:
-                        self.traiter_commande(trigger, audio_file, action_info)
+                        self.traiter_commande(trigger, audio_file, action_info, trace)
+            except Exception as e:
+                self._notify_error(f"Vosk error: {e}")
+                time.sleep(0.5)
+
+    def _loop_vosk_stream(self):
+        """
+        Streaming variant: one long-lived Vosk session.  Partial hypotheses
+        are checked against the trigger table so a command fires mid-phrase;
+        the final result only fires if nothing did during the utterance.
+        """
+        while self.is_listening:
+            fired: set[str] = set()
+            try:
+                for result in self._vosk.stream(
+                    running=lambda: self.is_listening,
+                    gate=self._echo_gate,
+                    on_level=self._on_level,
+                    tap=self._spot_tap,
+                ):
+                    self._on_stream_result(*result, fired)
             except Exception as e:
                 self._notify_error(f"Vosk error: {e}")
                 time.sleep(0.5)
 
+    def _on_stream_result(self, kind: str, texte: str, captured_at: float,
+                          dequeued_at: float, fired: set):
+        """Handle one hypothesis from VoskBackend.stream() (live or replay)."""
+        trace = self._new_trace()
+        trace.mark("capture_end", captured_at)
+        trace.mark("recog_start", dequeued_at)
+        trace.mark("recog_end")
+        if kind == "partial":
+            if not self.vosk_partial:
+                return
+            trigger, audio_file, action_info = self._matcher.search(texte)
+            if trigger and trigger not in fired:
+                # The speaker may still be saying a longer trigger: wait for
+                # the next partial (or the final) so the longest one wins.
+                if texte.endswith(trigger) and self._matcher.can_extend(trigger):
+                    return
+                fired.add(trigger)
+                trace.mark("match")
+                trace.text, trace.trigger = texte, trigger
+                self.traces.add(trace)
+                self._notify_word(f'Detected (partial): "{texte}"')
+                self.traiter_commande(trigger, audio_file, action_info, trace)
+            return
+
+        if texte:
+            trigger, audio_file, action_info = self._match(texte, trace)
+            if trigger and not fired:
+                self.traiter_commande(trigger, audio_file, action_info, trace)
+        fired.clear()
+
     def demarrer(self):
-        self.calibrer_micro()
         self._start_thread()
 
 
@@ -542,6 +2784,11 @@ def verifier_fichiers_audio():
 
 
 if __name__ == "__main__":
+    if "--headless" in sys.argv:
+        import ear_daemon
+        ear_daemon.main()
+        sys.exit(0)
+
     try:
         from ear_gui import VoiceAssistantGUI
 
@@ -549,8 +2796,12 @@ if __name__ == "__main__":
             import ctypes
             ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
 
-        verifier_fichiers_audio()
-        app = AudioCommandRecognizer()
+        if "--attach" in sys.argv:
+            from ear_daemon import RemoteRecognizer, daemon_address
+            app = RemoteRecognizer(*daemon_address())
+        else:
+            verifier_fichiers_audio()
+            app = AudioCommandRecognizer()
         gui = VoiceAssistantGUI(app)
         gui.run()
 
@@ -0,0 +1,258 @@
+"""
+EAR — Micro-benchmarks
+Run from the ear/ folder:  python ear_bench.py [name [args…]]
+
+matcher          : compiled TriggerMatcher vs. the old sequential
+                   `trigger in texte` scan, at 300 / 10k / 100k triggers.
+grammar file.wav : Vosk CPU per second of audio, full vocabulary vs. the
+                   trigger grammar (16 kHz mono WAV, model from config.ini).
+fuzzy            : FuzzyMatcher vs. a brute-force edit-distance scan over
+                   keywords.txt + actions.ini, on misspelled utterances.
+index            : TriggerIndex compile (parse + automaton + stat) vs. loading
+                   the memory-mapped cache, at 10k / 100k triggers.
+kws [folder]     : keyword-spotting templates — per trigger, the worst DTW
+                   distance to its own other templates vs. the nearest other
+                   trigger (pick kws_max_distance in between), and DTW cost.
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import wave
+
+from ear import (FuzzyMatcher, KeywordSpotter, TriggerIndex, TriggerMatcher, VoskBackend,
+                 load_actions, load_config, load_keywords, logger, phonetic_fr)
+
+
+# ──────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────
+def _timeit(fn, repeat: int) -> float:
+    """Mean seconds per call over `repeat` calls."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+
+def _synthetic_tables(n: int, rng: random.Random) -> tuple[dict, dict]:
+    words = set()
+    while len(words) < n:
+        words.add(" ".join(_random_word(rng) for _ in range(rng.randint(1, 3))))
+    commands = {w: f"sounds/{i}.mp3" for i, w in enumerate(words)}
+    commands = dict(sorted(commands.items(), key=lambda x: len(x[0]), reverse=True))
+    return {}, commands
+
+
+# ──────────────────────────────────────────────
+# Matcher
+# ──────────────────────────────────────────────
+def bench_matcher():
+    rng = random.Random(42)
+    utterances = [" ".join(_random_word(rng) for _ in range(6)) for _ in range(50)]
+
+    print(f"{'triggers':>10} {'build':>10} {'linear/utt':>12} {'automaton/utt':>14} {'speed-up':>9}")
+    for n in (300, 10_000, 100_000):
+        actions, commands = _synthetic_tables(n, rng)
+        # Plant one real trigger so both paths return something
+        utterances[0] = f"euh {next(iter(commands))} merci"
+
+        t0 = time.perf_counter()
+        matcher = TriggerMatcher(actions, commands)
+        build = time.perf_counter() - t0
+
+        def linear():
+            for texte in utterances:
+                for trigger in commands:
+                    if trigger in texte:
+                        break
+
+        def compiled():
+            for texte in utterances:
+                matcher.search(texte)
+
+        repeat = max(1, 2000 // n)
+        lin = _timeit(linear, repeat) / len(utterances)
+        aut = _timeit(compiled, 20) / len(utterances)
+        print(f"{n:>10} {build*1000:>8.0f}ms {lin*1e6:>10.0f}µs {aut*1e6:>12.1f}µs {lin/aut:>8.0f}x")
+
+
+# ──────────────────────────────────────────────
+# Vosk grammar
+# ──────────────────────────────────────────────
+def _decode_cpu(vosk: VoskBackend, frames: bytes) -> float:
+    """CPU seconds spent decoding `frames` with a fresh recognizer."""
+    rec  = vosk._new_recognizer()
+    step = vosk.BLOCKSIZE * 2
+    t0   = time.process_time()
+    for i in range(0, len(frames), step):
+        rec.AcceptWaveform(frames[i:i + step])
+    rec.FinalResult()
+    return time.process_time() - t0
+
+
+def bench_grammar(wav_path: str = ""):
+    if not wav_path:
+        print("usage: python ear_bench.py grammar recording.wav  (16 kHz mono int16)")
+        return
+    with wave.open(wav_path, "rb") as w:
+        if w.getframerate() != VoskBackend.SAMPLERATE or w.getnchannels() != 1:
+            print(f"{wav_path}: expected {VoskBackend.SAMPLERATE} Hz mono")
+            return
+        frames   = w.readframes(w.getnframes())
+        duration = w.getnframes() / w.getframerate()
+
+    cfg   = load_config()
+    vosk  = VoskBackend(cfg["recognition"].get("vosk_model_path"))
+    tables = TriggerMatcher(load_actions(), load_keywords())
+
+    vosk.set_grammar(None)
+    full = _decode_cpu(vosk, frames)
+    vosk.set_grammar(tables.triggers())
+    restricted = _decode_cpu(vosk, frames)
+
+    print(f"audio           {duration:>8.1f} s")
+    print(f"full vocabulary {full / duration * 1000:>8.0f} ms CPU / s audio")
+    print(f"trigger grammar {restricted / duration * 1000:>8.0f} ms CPU / s audio "
+          f"({len(tables)} phrases, {full / restricted:.1f}x less)")
+
+
+# ──────────────────────────────────────────────
+# Fuzzy matcher
+# ──────────────────────────────────────────────
+def _edit_distance_substring(pattern: str, texte: str) -> int:
+    """Textbook O(m·n) dynamic programme — the brute-force reference."""
+    prev = [0] * (len(texte) + 1)
+    for i, a in enumerate(pattern, 1):
+        cur = [i] + [0] * len(texte)
+        for j, b in enumerate(texte, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a != b))
+        prev = cur
+    return min(prev)
+
+
+def _misspell(trigger: str, rng: random.Random) -> str:
+    chars = list(trigger)
+    i = rng.randrange(len(chars))
+    op = rng.choice(("swap", "drop", "split"))
+    if op == "swap":
+        chars[i] = rng.choice("aeiou")
+    elif op == "drop" and len(chars) > 3:
+        del chars[i]
+    else:
+        chars.insert(i, " ")
+    return "".join(chars)
+
+
+def bench_fuzzy():
+    rng      = random.Random(7)
+    actions  = load_actions()
+    commands = load_keywords()
+    fuzzy    = FuzzyMatcher(actions, commands)
+    triggers = [t for t in (*actions, *commands) if len(phonetic_fr(t)) >= fuzzy.min_length]
+    keys     = [(t, phonetic_fr(t)) for t in triggers]
+    queries  = [f"euh {_misspell(rng.choice(triggers), rng)} voilà" for _ in range(200)]
+
+    def brute(texte):
+        key = phonetic_fr(texte)
+        best, best_score = None, 0.0
+        for trigger, tkey in keys:
+            dist = _edit_distance_substring(tkey, key)
+            if dist <= max(1, int(len(tkey) * fuzzy.max_ratio)):
+                score = 1.0 - dist / len(tkey)
+                if score > best_score:
+                    best, best_score = trigger, score
+        return best
+
+    agree = sum(fuzzy.search(q)[0] == brute(q) for q in queries)
+    idx = _timeit(lambda: [fuzzy.search(q) for q in queries], 5) / len(queries)
+    bf  = _timeit(lambda: [brute(q) for q in queries], 1) / len(queries)
+    print(f"{len(fuzzy)} indexed triggers, {len(queries)} misspelled queries")
+    print(f"brute force  {bf * 1e6:>9.0f} µs / query")
+    print(f"index        {idx * 1e6:>9.0f} µs / query  ({bf / idx:.0f}x faster, "
+          f"same answer on {agree}/{len(queries)})")
+
+
+# ──────────────────────────────────────────────
+# Trigger index cache
+# ──────────────────────────────────────────────
+def bench_index():
+    rng = random.Random(11)
+    logger.setLevel("WARNING")
+    print(f"{'triggers':>10} {'compile':>10} {'cached load':>12} {'1st search':>11}")
+    for n in (10_000, 100_000):
+        _, commands = _synthetic_tables(n, rng)
+        with tempfile.TemporaryDirectory() as folder:
+            keywords = os.path.join(folder, "keywords.txt")
+            actions  = os.path.join(folder, "actions.ini")
+            with open(keywords, "w", encoding="utf-8") as f:
+                f.writelines(f"{t} = {audio}\n" for t, audio in commands.items())
+            open(actions, "w").close()
+
+            t0 = time.perf_counter()
+            TriggerIndex.load(keywords, actions)
+            cold = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            index = TriggerIndex.load(keywords, actions)
+            warm = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            index.matcher.search(f"euh {next(iter(commands))} merci")
+            first = time.perf_counter() - t0
+            del index                             # release the mapping before cleanup
+        print(f"{n:>10} {cold*1000:>8.0f}ms {warm*1000:>10.1f}ms {first*1e6:>9.0f}µs")
+
+
+# ──────────────────────────────────────────────
+# Keyword spotting
+# ──────────────────────────────────────────────
+def bench_kws(folder: str = ""):
+    folder  = folder or load_config()["recognition"].get("kws_templates", "kws")
+    spotter = KeywordSpotter(folder)
+    refs    = [(t, f) for t, feats in spotter.templates.items() for f in feats]
+    if len(refs) < 2:
+        print(f"need at least two templates in {folder}/  (<trigger>__<n>.wav)")
+        return
+
+    print(f"{'trigger':<24} {'templates':>9} {'same':>7} {'other':>7}")
+    for trigger, feats in spotter.templates.items():
+        same = 0.0
+        other = float("inf")
+        for i, (t, f) in enumerate(refs):
+            if t != trigger:
+                continue
+            own = [spotter.dtw(f, g) for j, (u, g) in enumerate(refs) if u == t and j != i]
+            same = max(same, min(own, default=float("nan")))
+            other = min([other] + [spotter.dtw(f, g) for u, g in refs if u != t])
+        print(f"{trigger:<24} {len(feats):>9} {same:>7.2f} {other:>7.2f}")
+
+    per_dtw = _timeit(lambda: [spotter.dtw(refs[0][1], g) for _, g in refs], 5) / len(refs)
+    print(f"\n{len(refs)} templates, {per_dtw * 1000:.2f} ms per DTW "
+          f"→ ~{per_dtw * len(refs) * 1000:.0f} ms to spot one word")
+
+
+BENCHES = {
+    "matcher": bench_matcher,
+    "grammar": bench_grammar,
+    "fuzzy":   bench_fuzzy,
+    "index":   bench_index,
+    "kws":     bench_kws,
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        runs = [(sys.argv[1], sys.argv[2:])]
+    else:
+        runs = [(name, []) for name in BENCHES]
+    for name, args in runs:
+        print(f"\n── {name} " + "─" * (40 - len(name)))
+        BENCHES[name](*args)
@@ -0,0 +1,438 @@
+"""
+EAR — Headless daemon + local control API
+Runs AudioCommandRecognizer without Tk and exposes it on a small HTTP API
+bound to the local machine.  The Tk GUI can attach to it (ear.py --attach)
+through RemoteRecognizer, which mimics the engine's interface.
+
+Run from the ear/ folder:  python ear_daemon.py      (or: python ear.py --headless)
+
+GET  /stats               engine state, table sizes, VAD and latency figures
+GET  /tables              trigger → sound file, action triggers
+GET  /history?offset=0&limit=100   command history page, newest first
+GET  /history/aggregates  counts per trigger / hour of day / backend
+GET  /traces?format=csv   latency traces (csv | json)
+GET  /events              server-sent events: the engine's callback hooks
+POST /start  /stop        start / stop listening
+POST /reload/<what>       keywords | actions | config
+POST /calibrate  /measure apply / report the noise-floor threshold
+POST /play  {"file": …}   play a sound        POST /stop_sound
+
+POST requests must carry Content-Type: application/json, no Origin other
+than the daemon's own, and X-EAR-Token when [daemon] token is set; anything
+else gets 403.
+"""
+
+import hmac
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ear import AudioCommandRecognizer, load_config, logger, verifier_fichiers_audio
+
+HISTORY_SIZE = 200
+
+# Callback hook → event type (same names as the GUI message queue)
+_HOOKS = {
+    "on_word_heard":       "word",
+    "on_command_detected": "command",
+    "on_audio_playing":    "audio_play",
+    "on_error":            "error",
+    "on_listening_start":  "listen_start",
+    "on_listening_stop":   "listen_stop",
+}
+
+
+def daemon_address(cfg=None) -> tuple[str, int]:
+    cfg = cfg or load_config()
+    sec = cfg["daemon"]
+    return sec.get("host", "127.0.0.1"), int(sec.get("port", "8765"))
+
+
+# ──────────────────────────────────────────────
+# Engine side
+# ──────────────────────────────────────────────
+class EngineServer:
+    """Wraps the engine's callback hooks into an event bus + command history."""
+
+    def __init__(self, app: AudioCommandRecognizer, host: str, port: int):
+        self.app     = app
+        self.recent  = deque(maxlen=HISTORY_SIZE)   # used when history_db is empty
+        self.token   = app.cfg["daemon"].get("token", "").strip()
+        self.origins = {f"http://{host}:{port}", f"http://localhost:{port}"}
+        self._subscribers: list[queue.Queue] = []
+        self._sub_lock = threading.Lock()
+        for hook, kind in _HOOKS.items():
+            setattr(app, hook, self._make_hook(kind))
+
+        handler = type("EARHandler", (_Handler,), {"server_ref": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    def _make_hook(self, kind: str):
+        def _hook(*data):
+            if kind == "command" and self.app.history is None:
+                trigger, audio_file, action_info = data
+                self.recent.append((time.time(), trigger,
+                                    "App/File" if action_info else "Audio", self.app.backend))
+            elif kind == "error":
+                logger.warning(data[0])
+            self.publish(kind, list(data))
+        return _hook
+
+    def publish(self, kind: str, data: list):
+        event = json.dumps({"type": kind, "data": data}, ensure_ascii=False, default=str)
+        with self._sub_lock:
+            for q in self._subscribers:
+                try:
+                    q.put_nowait(event)
+                except queue.Full:
+                    # A client that stopped reading must not block the engine hooks
+                    logger.debug("events: subscriber queue full, event dropped")
+
+    def subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=1000)
+        with self._sub_lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._sub_lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def serve_forever(self):
+        host, port = self.httpd.server_address[:2]
+        logger.info(f"EAR daemon listening on http://{host}:{port}")
+        self.httpd.serve_forever()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_ref: EngineServer = None
+
+    def log_message(self, fmt, *args):
+        logger.debug("api: " + fmt % args)
+
+    def _send(self, status: int, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else \
+            json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    # ── GET ───────────────────────────────────
+    def do_GET(self):
+        srv, app = self.server_ref, self.server_ref.app
+        url   = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/stats":
+            self._send(200, app.stats())
+        elif url.path == "/tables":
+            self._send(200, {"commands": app.commands, "actions": list(app.system_actions)})
+        elif url.path == "/history":
+            try:
+                offset = int(query.get("offset", ["0"])[0])
+                limit  = int(query.get("limit", ["100"])[0])
+            except ValueError:
+                self._send(400, {"error": "offset and limit must be integers"})
+                return
+            if app.history:
+                total, rows = app.history.count(), app.history.page(offset, limit)
+            else:
+                recent = list(srv.recent)[::-1]
+                total, rows = len(recent), recent[offset:offset + limit]
+            self._send(200, {"total": total, "rows": rows})
+        elif url.path == "/history/aggregates":
+            if not app.history:
+                self._send(404, {"error": "history_db is disabled"})
+                return
+            self._send(200, {"triggers": app.history.top_triggers(100),
+                             "hours":    app.history.by_hour(),
+                             "backends": app.history.by_backend()})
+        elif url.path == "/traces":
+            fmt = query.get("format", ["csv"])[0]
+            fd, tmp = tempfile.mkstemp(suffix=f".{'json' if fmt == 'json' else 'csv'}")
+            os.close(fd)
+            try:
+                app.export_traces(tmp)
+                with open(tmp, "rb") as f:
+                    data = f.read()
+            finally:
+                os.remove(tmp)
+            self._send(200, data, "application/json" if fmt == "json" else "text/csv")
+        elif url.path == "/events":
+            self._stream_events()
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _stream_events(self):
+        srv = self.server_ref
+        q   = srv.subscribe()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                try:
+                    event = q.get(timeout=15)
+                    self.wfile.write(f"data: {event}\n\n".encode("utf-8"))
+                except queue.Empty:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            srv.unsubscribe(q)
+
+    # ── POST ──────────────────────────────────
+    def _allowed(self) -> bool:
+        """
+        Refuse POSTs a web page could send: a browser cannot set a JSON
+        Content-Type or a custom header cross-origin without a CORS preflight
+        (never answered here), and it always sends Origin.
+        """
+        srv = self.server_ref
+        if self.headers.get_content_type() != "application/json":
+            return False
+        origin = self.headers.get("Origin")
+        if origin and origin not in srv.origins:
+            return False
+        return not srv.token or hmac.compare_digest(self.headers.get("X-EAR-Token", ""),
+                                                    srv.token)
+
+    def do_POST(self):
+        app  = self.server_ref.app
+        path = urlparse(self.path).path
+
+        if not self._allowed():
+            self._send(403, {"error": "forbidden"})
+            return
+        if path == "/start":
+            if not app.is_listening:
+                app._start_thread()
+            self._send(200, {"listening": True})
+        elif path == "/stop":
+            app.is_listening = False
+            self._send(200, {"listening": False})
+        elif path.startswith("/reload/"):
+            what = path.rsplit("/", 1)[1]
+            reload = {"keywords": app.reload_keywords,
+                      "actions":  app.reload_actions,
+                      "config":   app.reload_config}.get(what)
+            if not reload:
+                self._send(400, {"error": f"unknown table '{what}'"})
+                return
+            reload()
+            self._send(200, app.stats())
+        elif path == "/calibrate":
+            app.calibrer_micro()
+            self._send(200, {"threshold": app.energy_thresh})
+        elif path == "/measure":
+            self._send(200, {"suggested": app.measure_threshold()})
+        elif path == "/play":
+            fichier = self._body().get("file", "")
+            app.jouer_audio(fichier)
+            self._send(202, {"queued": fichier})
+        elif path == "/stop_sound":
+            app.arreter_audio()
+            self._send(200, {"stopped": True})
+        else:
+            self._send(404, {"error": "not found"})
+
+
+def main():
+    verifier_fichiers_audio()
+    app = AudioCommandRecognizer()
+    host, port = daemon_address(app.cfg)
+    server = EngineServer(app, host, port)
+    app._start_thread()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("EAR daemon stopping…")
+        app._stop_and_wait()
+        if app.history:
+            app.history.close()
+
+
+# ──────────────────────────────────────────────
+# Client side (GUI attached to a running daemon)
+# ──────────────────────────────────────────────
+class RemoteHistory:
+    """HistoryStore reader interface served by the daemon."""
+
+    def __init__(self, remote: "RemoteRecognizer"):
+        self._remote = remote
+
+    def count(self) -> int:
+        return self._remote._call("GET", "/history?limit=0")["total"]
+
+    def page(self, offset: int = 0, limit: int = 100) -> list:
+        return self._remote._call("GET", f"/history?offset={offset}&limit={limit}")["rows"]
+
+    def top_triggers(self, limit: int = 20) -> list:
+        return self._remote._call("GET", "/history/aggregates")["triggers"][:limit]
+
+    def by_hour(self) -> dict:
+        hours = self._remote._call("GET", "/history/aggregates")["hours"]
+        return {int(h): n for h, n in hours.items()}
+
+    def by_backend(self) -> dict:
+        return self._remote._call("GET", "/history/aggregates")["backends"]
+
+
+class RemoteRecognizer:
+    """
+    Drop-in stand-in for AudioCommandRecognizer that forwards every call to a
+    running daemon and replays its event stream into the usual on_* hooks,
+    so VoiceAssistantGUI works unchanged as a client.
+    """
+
+    is_remote = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+        self.base = f"http://{host}:{port}"
+        self.on_command_detected = None
+        self.on_audio_playing    = None
+        self.on_error            = None
+        self.on_listening_start  = None
+        self.on_listening_stop   = None
+        self.on_word_heard       = None
+
+        cfg = load_config()
+        self.log_max_lines  = int(cfg["commands"].get("log_max_lines", "500"))
+        self._token         = cfg["daemon"].get("token", "").strip()
+        self._stats         = self._call("GET", "/stats")   # fails fast if no daemon
+        self.commands: dict = {}
+        self.system_actions: dict = {}
+        self._refresh_tables()
+        self.history = RemoteHistory(self)
+
+        self._detached = threading.Event()
+        threading.Thread(target=self._event_loop, daemon=True, name="EAR-remote").start()
+
+    # ── HTTP ──────────────────────────────────
+    def _call(self, method: str, path: str, payload: dict | None = None, raw=False):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self._token:
+            headers["X-EAR-Token"] = self._token
+        req  = urllib.request.Request(self.base + path, data=data, method=method,
+                                      headers=headers)
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            body = resp.read()
+        return body if raw else json.loads(body or b"{}")
+
+    def _refresh_tables(self):
+        tables = self._call("GET", "/tables")
+        self.commands       = tables.get("commands", {})
+        self.system_actions = dict.fromkeys(tables.get("actions", []))
+
+    def _event_loop(self):
+        hooks = {kind: hook for hook, kind in _HOOKS.items()}
+        while not self._detached.is_set():
+            try:
+                with urllib.request.urlopen(self.base + "/events", timeout=30) as resp:
+                    for raw in resp:
+                        if self._detached.is_set():
+                            return
+                        line = raw.decode("utf-8").strip()
+                        if not line.startswith("data:"):
+                            continue
+                        event = json.loads(line[5:])
+                        kind  = event["type"]
+                        if kind == "listen_start":
+                            self._stats["listening"] = True
+                        elif kind == "listen_stop":
+                            self._stats["listening"] = False
+                        callback = getattr(self, hooks.get(kind, ""), None)
+                        if callback:
+                            callback(*event["data"])
+            except Exception as e:
+                if self.on_error and not self._detached.is_set():
+                    self.on_error(f"Lost connection to EAR daemon ({e}) — retrying…")
+                time.sleep(2)
+
+    def detach(self):
+        self._detached.set()
+
+    # ── Engine interface used by the GUI ──────
+    @property
+    def backend(self) -> str:
+        return self._stats.get("backend", "?")
+
+    @property
+    def load_state(self) -> str:
+        return self._stats.get("loading", "ready")
+
+    @property
+    def is_listening(self) -> bool:
+        return self._stats.get("listening", False)
+
+    @is_listening.setter
+    def is_listening(self, value: bool):
+        self._call("POST", "/start" if value else "/stop")
+        self._stats["listening"] = value
+
+    def _start_thread(self):
+        self.is_listening = True
+
+    def stats(self) -> dict:
+        self._stats = self._call("GET", "/stats")
+        return self._stats
+
+    def reload_keywords(self):
+        self._stats = self._call("POST", "/reload/keywords")
+        self._refresh_tables()
+
+    def reload_actions(self):
+        self._stats = self._call("POST", "/reload/actions")
+        self._refresh_tables()
+
+    def reload_config(self):
+        self._stats = self._call("POST", "/reload/config")
+        self._refresh_tables()
+
+    def calibrer_micro(self):
+        self._call("POST", "/calibrate")
+
+    def measure_threshold(self):
+        self._call("POST", "/measure")
+
+    def jouer_audio(self, fichier: str, priority: int = 0):
+        self._call("POST", "/play", {"file": fichier})
+
+    def arreter_audio(self):
+        self._call("POST", "/stop_sound")
+
+    def export_traces(self, path: str) -> int:
+        fmt  = "json" if path.lower().endswith(".json") else "csv"
+        data = self._call("GET", f"/traces?format={fmt}", raw=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        if fmt == "json":
+            return len(json.loads(data))
+        return max(0, data.count(b"\n") - 1)
+
+
+if __name__ == "__main__":
+    main()
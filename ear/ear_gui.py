@@ -1,11 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
-import threading
+from tkinter import ttk, scrolledtext, filedialog
 import queue
+import re
+import threading
+import time
+from collections import deque
 from datetime import datetime
 import os
 import platform
-import pygame
 
 # ─────────────────────────────────────────────────────────────
 # Palette
@@ -28,6 +30,94 @@ FONT_SMALL  = ("Segoe UI", 9)
 FONT_MONO   = ("Consolas", 10)
 FONT_STAT   = ("Segoe UI", 11, "bold")
 
+# Event log rendering
+LOG_BATCH_MAX   = 500    # queue messages handled per tick (the rest wait 80 ms)
+LOG_PRUNE_SHARE = 0.1    # share of log_max_lines dropped at once when the cap is hit
+FILTER_DELAY_MS = 200    # filter runs once typing pauses this long
+HIST_PAGE       = 100    # command history rows shown per page
+
+
+# ─────────────────────────────────────────────────────────────
+# Event log model
+# ─────────────────────────────────────────────────────────────
+class LogStore:
+    """
+    Bounded store of event-log records with an incremental token index.
+
+    Records are (id, ts, tag, message, color). Ids only grow, so each token's
+    posting list is sorted and evicting the oldest record pops from its front.
+    A filter looks up the tokens containing each query word, intersects their
+    ids and checks the remaining lines — it never walks the Text widget.
+    """
+
+    _TOKEN = re.compile(r"\w+")
+
+    def __init__(self, cap: int):
+        self.cap = cap
+        self._records: deque = deque()
+        self._postings: dict[str, deque] = {}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    @staticmethod
+    def line(rec: tuple) -> str:
+        _, ts, tag, message, _ = rec
+        return f"[{ts}] {tag:<6}  {message}"
+
+    def _tokens(self, rec: tuple) -> set:
+        return set(self._TOKEN.findall(self.line(rec).lower()))
+
+    def add(self, ts: str, tag: str, message: str, color: str) -> tuple:
+        rec = (self._next_id, ts, tag, message, color)
+        self._next_id += 1
+        self._records.append(rec)
+        for token in self._tokens(rec):
+            self._postings.setdefault(token, deque()).append(rec[0])
+        self._evict()
+        return rec
+
+    def resize(self, cap: int):
+        self.cap = cap
+        self._evict()
+
+    def _evict(self):
+        while len(self._records) > self.cap:
+            old = self._records.popleft()
+            for token in self._tokens(old):
+                ids = self._postings[token]
+                ids.popleft()
+                if not ids:
+                    del self._postings[token]
+
+    def clear(self):
+        self._records.clear()
+        self._postings.clear()
+
+    def search(self, query: str) -> list:
+        """Records whose line contains `query` (case-insensitive), oldest first."""
+        query = query.lower()
+        words = self._TOKEN.findall(query)
+        if not words or not self._records:
+            candidates = self._records
+        else:
+            ids = None
+            for word in words:
+                hits = set()
+                for token, postings in self._postings.items():
+                    if word in token:
+                        hits.update(postings)
+                ids = hits if ids is None else ids & hits
+                if not ids:
+                    return []
+            first = self._records[0][0]
+            candidates = [self._records[i - first] for i in sorted(ids)]
+        return [rec for rec in candidates if query in self.line(rec).lower()]
+
 
 class VoiceAssistantGUI:
 
@@ -39,8 +129,19 @@ class VoiceAssistantGUI:
         self.command_count  = 0
         self.error_count    = 0
         self.word_count     = 0
+        self._stats_busy    = False
         self.start_time     = datetime.now()
 
+        # Event log model: records are rendered in one insert per tick
+        self._log_store    = LogStore(self._log_cap())
+        self._log_pending: list = []
+        self._log_rendered = 0          # lines currently in the Text widget
+        self._color_tags: dict  = {}
+        self._filter_query = ""
+        self._filter_job   = None
+        self._hist_offset  = 0          # first history row shown (0 = newest)
+        self._loading      = True       # status bar shows start-up progress
+
         self.root = tk.Tk()
         self.root.title("EAR — Enhanced Audio Recognition")
         self.root.geometry("980x700")
@@ -86,6 +187,13 @@ class VoiceAssistantGUI:
 
         self.check_queue()
         self._tick_uptime()
+        self._tick_stats()
+        self._load_t0 = time.perf_counter()
+        self._tick_loading()
+
+        mark_startup = getattr(self.recognizer, "mark_startup", None)
+        if mark_startup:
+            self.root.after_idle(mark_startup, "window")
 
         # Auto-start after 1 s
         self.root.after(1000, self.start_listening)
@@ -242,6 +350,7 @@ class VoiceAssistantGUI:
 
         _btn("Calibrate Microphone", self.calibrate_mic)
         _btn("Sound Test",           self.test_audio)
+        _btn("Stop Sound",           self.stop_audio)
 
         ttk.Separator(side).pack(fill="x", padx=12, pady=8)
 
@@ -260,6 +369,7 @@ class VoiceAssistantGUI:
                  fg=FG_DIM, bg=PANEL).pack(anchor="w", padx=14, pady=(0, 4))
 
         _btn("Measure Threshold", self.measure_threshold)
+        _btn("Export Traces",     self.export_traces)
         _btn("Clear Log",         self.clear_log)
 
         # ── Separator ──────────────────────────
@@ -272,8 +382,23 @@ class VoiceAssistantGUI:
         self._stat_commands = self._make_stat_row(side, "Commands")
         self._stat_words    = self._make_stat_row(side, "Words heard")
         self._stat_errors   = self._make_stat_row(side, "Errors")
+        self._stat_noise    = self._make_stat_row(side, "Noise dropped")
+        self._stat_floor    = self._make_stat_row(side, "Floor / thresh.")
+        self._stat_kws      = self._make_stat_row(side, "Spotted / p50")
         self._stat_uptime   = self._make_stat_row(side, "Uptime")
 
+        # ── Latency (p50 / p95 ms) ─────────────
+        tk.Label(side, text="LATENCY  p50 / p95 ms", font=("Segoe UI", 8, "bold"),
+                 fg=FG_DIM, bg=PANEL).pack(anchor="w", padx=14, pady=(10, 6))
+
+        self._stat_latency = {
+            span: self._make_stat_row(side, label)
+            for span, label in (("recognize", "Recognize"),
+                                ("dispatch",  "Match → dispatch"),
+                                ("playback",  "Dispatch → sound"),
+                                ("total",     "Total"))
+        }
+
     def _make_stat_row(self, parent, label):
         row = tk.Frame(parent, bg=PANEL)
         row.pack(fill="x", padx=14, pady=2)
@@ -314,7 +439,7 @@ class VoiceAssistantGUI:
                  fg=FG_DIM, bg=BG).pack(side="left", padx=(2, 4))
 
         self._search_var = tk.StringVar()
-        self._search_var.trace_add("write", lambda *_: self._apply_filter())
+        self._search_var.trace_add("write", lambda *_: self._schedule_filter())
         search_entry = tk.Entry(search_row, textvariable=self._search_var,
                                 font=FONT_MONO, bg=PANEL, fg=FG,
                                 insertbackground=FG, relief="flat",
@@ -338,6 +463,9 @@ class VoiceAssistantGUI:
             padx=8, pady=6
         )
         self.log_text.pack(fill="both", expand=True)
+        for color in (FG, FG_DIM, ACCENT, SUCCESS, ERROR, WARN, GOLD, MAUVE):
+            self._color_tag(color)
+        self.log_text.tag_configure("highlight", background="#45475a")
 
         # Tab 2 — Command history
         hist_tab = tk.Frame(self._notebook, bg=BG)
@@ -361,11 +489,27 @@ class VoiceAssistantGUI:
             self._hist_tree.heading(col, text=col)
             self._hist_tree.column(col, width=w, anchor="w")
 
+        # Pager + hottest triggers (from the history store's aggregates)
+        pager = tk.Frame(hist_tab, bg=BG)
+        pager.pack(side="bottom", fill="x", pady=(4, 0))
+        ttk.Button(pager, text="◀ Newer", style="EAR.TButton",
+                   command=lambda: self._hist_page(-1)).pack(side="left")
+        self._hist_page_var = tk.StringVar(value="")
+        tk.Label(pager, textvariable=self._hist_page_var, font=FONT_SMALL,
+                 fg=FG_DIM, bg=BG).pack(side="left", padx=8)
+        ttk.Button(pager, text="Older ▶", style="EAR.TButton",
+                   command=lambda: self._hist_page(1)).pack(side="left")
+        self._hist_top_var = tk.StringVar(value="")
+        tk.Label(pager, textvariable=self._hist_top_var, font=FONT_SMALL,
+                 fg=MAUVE, bg=BG, anchor="e").pack(side="right", fill="x", expand=True)
+
         vsb = ttk.Scrollbar(hist_tab, orient="vertical",
                              command=self._hist_tree.yview)
         self._hist_tree.configure(yscrollcommand=vsb.set)
         vsb.pack(side="right", fill="y")
         self._hist_tree.pack(fill="both", expand=True)
+        self._hist_tab = hist_tab
+        self._hist_load()
 
         # ── Last command footer ────────────────
         footer = tk.Frame(right, bg=PANEL, height=36)
@@ -429,24 +573,23 @@ class VoiceAssistantGUI:
     # Queue processor
     # ──────────────────────────────────────────
     def check_queue(self):
+        """Drain up to LOG_BATCH_MAX messages, then render them in one pass."""
+        words = commands = errors = 0
         try:
-            while True:
-                item = self.message_queue.get_nowait()
-                msg_type, *data = item
+            for _ in range(LOG_BATCH_MAX):
+                msg_type, *data = self.message_queue.get_nowait()
 
                 if msg_type == "word":
-                    self.word_count += 1
-                    self._stat_words.set(str(self.word_count))
+                    words += 1
                     self._log("HEARD", data[0], color=GOLD)
 
                 elif msg_type == "command":
                     cmd, audio_file, action_info = data
-                    self.command_count += 1
-                    self._stat_commands.set(str(self.command_count))
+                    commands += 1
                     self._last_cmd_var.set(f'"{cmd}"')
 
                     if action_info:
-                        kind = "File" if action_info.get("type") == "fichier" else "App"
+                        kind = "File" if action_info.get("type") == "file" else "App"
                         self._log("CMD", f"[{kind}] {cmd}", color=MAUVE)
                         self._hist_add(cmd, kind)
                     elif audio_file:
@@ -461,8 +604,7 @@ class VoiceAssistantGUI:
                     self._log("PLAY", fname, color=ACCENT)
 
                 elif msg_type == "error":
-                    self.error_count += 1
-                    self._stat_errors.set(str(self.error_count))
+                    errors += 1
                     self._log("ERR", data[0], color=ERROR)
 
                 elif msg_type == "listen_start":
@@ -473,64 +615,195 @@ class VoiceAssistantGUI:
                     self._set_status("Idle", FG_DIM)
                     self._log("SYS", "Microphone stopped", color=FG_DIM)
 
+                elif msg_type == "stats":
+                    self._show_stats(*data)
+
+                elif msg_type == "done":
+                    callback, result, error = data
+                    if error:
+                        errors += 1
+                        self._log("ERR", error, color=ERROR)
+                    elif callback:
+                        callback(result)
+
                 self.message_queue.task_done()
 
+        except queue.Empty:
+            pass
         except Exception:
             pass
 
+        if words:
+            self.word_count += words
+            self._stat_words.set(str(self.word_count))
+        if commands:
+            self.command_count += commands
+            self._stat_commands.set(str(self.command_count))
+        if errors:
+            self.error_count += errors
+            self._stat_errors.set(str(self.error_count))
+        self._flush_log()
+
         self.root.after(80, self.check_queue)
 
+    def _in_background(self, work, done=None, what: str = "Request", failed=None):
+        """
+        Run `work()` on a worker thread; `done(result)` then runs on the Tk
+        thread.  On an exception `failed(exc)` runs instead, or it is logged.
+        """
+        def _worker():
+            try:
+                self.message_queue.put(("done", done, work(), None))
+            except Exception as e:
+                if failed:
+                    self.message_queue.put(("done", failed, e, None))
+                else:
+                    self.message_queue.put(("done", None, None, f"{what} failed: {e}"))
+        threading.Thread(target=_worker, daemon=True, name="EAR-gui-task").start()
+
     # ──────────────────────────────────────────
     # Log helpers
     # ──────────────────────────────────────────
     def _log(self, tag: str, message: str, color: str = FG):
-        """Append a coloured line; prune oldest lines when cap is reached."""
-        ts   = datetime.now().strftime("%H:%M:%S")
-        line = f"[{ts}] {tag:<6}  {message}\n"
+        """Store a coloured line; check_queue renders it on the next tick."""
+        ts = datetime.now().strftime("%H:%M:%S")
+        rec = self._log_store.add(ts, tag, str(message).replace("\n", " "), color)
+        self._log_pending.append(rec)
+
+    def _log_cap(self) -> int:
+        return max(1, int(getattr(self.recognizer, "log_max_lines", 500)))
+
+    def _color_tag(self, color: str) -> str:
+        """Text tag for `color`, configured the first time it is used."""
+        tag_name = self._color_tags.get(color)
+        if tag_name is None:
+            tag_name = f"col_{color.replace('#', '')}"
+            self.log_text.tag_configure(tag_name, foreground=color)
+            self._color_tags[color] = tag_name
+        return tag_name
+
+    def _line_chunks(self, rec: tuple) -> list:
+        """text/tags pairs for one record, with the filter matches highlighted."""
+        line  = LogStore.line(rec) + "\n"
+        color = self._color_tag(rec[4])
+        query = self._filter_query
+        if not query:
+            return [line, color]
+        chunks, low, pos = [], line.lower(), 0
+        while (hit := low.find(query, pos)) >= 0:
+            end = hit + len(query)
+            chunks += (line[pos:hit], color, line[hit:end], (color, "highlight"))
+            pos = end
+        chunks += (line[pos:], color)
+        return chunks
+
+    def _render(self, records, replace: bool = False):
+        """Append (or replace the view with) `records` in a single insert."""
+        chunks = []
+        for rec in records:
+            chunks += self._line_chunks(rec)
 
         self.log_text.configure(state="normal")
-
-        # Log rotation — remove oldest line when over cap
-        max_lines = getattr(self.recognizer, "log_max_lines", 500)
-        current   = int(self.log_text.index("end-1c").split(".")[0])
-        if current > max_lines:
-            self.log_text.delete("1.0", "2.0")
-
-        start = self.log_text.index("end-1c")
-        self.log_text.insert(tk.END, line)
-        end   = self.log_text.index("end-1c")
-
-        tag_name = f"col_{color.replace('#', '')}"
-        self.log_text.tag_configure(tag_name, foreground=color)
-        self.log_text.tag_add(tag_name, start, end)
+        if replace:
+            self.log_text.delete("1.0", tk.END)
+            self._log_rendered = 0
+        if chunks:
+            self.log_text.insert(tk.END, *chunks)
+        self._log_rendered += len(records)
+
+        # Over the cap: drop the oldest lines down to cap minus one chunk, so
+        # the next deletion only happens after another chunk has arrived
+        cap = self._log_cap()
+        if self._log_rendered > cap:
+            keep = cap - int(cap * LOG_PRUNE_SHARE)
+            self.log_text.delete("1.0", f"{self._log_rendered - keep + 1}.0")
+            self._log_rendered = keep
 
         self.log_text.see(tk.END)
         self.log_text.configure(state="disabled")
-        self._sb_var.set(message[:80])
 
-    def _apply_filter(self):
-        """Highlight lines matching the search string."""
-        self.log_text.tag_remove("highlight", "1.0", tk.END)
-        query = self._search_var.get().strip().lower()
-        if not query:
+    def _flush_log(self):
+        """Render the records logged since the last tick."""
+        if not self._log_pending:
             return
-        self.log_text.tag_configure("highlight", background="#45475a")
-        start = "1.0"
-        while True:
-            pos = self.log_text.search(query, start, nocase=True, stopindex=tk.END)
-            if not pos:
-                break
-            end = f"{pos}+{len(query)}c"
-            self.log_text.tag_add("highlight", pos, end)
-            start = end
+        pending, self._log_pending = self._log_pending, []
+        if not self._loading:
+            self._sb_var.set(pending[-1][3][:80])
+
+        cap = self._log_cap()
+        if self._log_store.cap != cap:               # log_max_lines reloaded
+            self._log_store.resize(cap)
+        if self._filter_query:
+            pending = [r for r in pending if self._filter_query in LogStore.line(r).lower()]
+        self._render(pending[-cap:])
+
+    def _schedule_filter(self):
+        """Debounce the filter box: re-filter once typing pauses."""
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        """Show only the records matching the search string, matches highlighted."""
+        self._filter_job   = None
+        self._filter_query = self._search_var.get().strip().lower()
+        self._log_pending.clear()                    # already in the store
+        if self._filter_query:
+            self._render(self._log_store.search(self._filter_query), replace=True)
+        else:
+            self._render(list(self._log_store), replace=True)
 
     def _clear_filter(self):
         self._search_var.set("")
-        self.log_text.tag_remove("highlight", "1.0", tk.END)
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._apply_filter()
 
     def _hist_add(self, cmd: str, kind: str):
+        """Live row on the first page; the engine has already persisted it."""
+        if self._hist_offset:
+            return
         ts = datetime.now().strftime("%H:%M:%S")
         self._hist_tree.insert("", 0, values=(ts, cmd, kind))
+        rows = self._hist_tree.get_children()
+        if len(rows) > HIST_PAGE:
+            self._hist_tree.delete(*rows[HIST_PAGE:])
+
+    def _hist_load(self, step: int = 0):
+        """Fill the Treeview with one page of the persistent history, `step` pages away."""
+        store = getattr(self.recognizer, "history", None)
+        if store is None:
+            self._hist_page_var.set("not persisted")
+            return
+        offset = self._hist_offset
+
+        def _fetch():
+            total = store.count()
+            last  = max(0, (total - 1) // HIST_PAGE * HIST_PAGE)
+            start = min(last, max(0, offset + step * HIST_PAGE))
+            return total, start, store.page(start, HIST_PAGE), store.top_triggers(5)
+
+        def _show(result):
+            total, self._hist_offset, rows, top = result
+            self._hist_tree.delete(*self._hist_tree.get_children())
+            for ts, trigger, kind, _backend in rows:
+                when = datetime.fromtimestamp(ts)
+                fmt  = "%H:%M:%S" if when.date() == datetime.now().date() else "%d/%m %H:%M"
+                self._hist_tree.insert("", "end", values=(when.strftime(fmt), trigger, kind))
+            pages = max(1, -(-total // HIST_PAGE))
+            self._hist_page_var.set(f"page {self._hist_offset // HIST_PAGE + 1} / {pages}"
+                                    f"  ({total} commands)")
+            self._hist_show_top(top)
+
+        self._in_background(_fetch, _show, failed=lambda e: self._hist_page_var.set(
+            f"history unavailable: {e}"))
+
+    def _hist_page(self, step: int):
+        self._hist_load(step)
+
+    def _hist_show_top(self, top: list):
+        self._hist_top_var.set("Hot: " + "  ·  ".join(f"{t} {n}" for t, n, _ in top)
+                               if top else "")
 
     # ──────────────────────────────────────────
     # Status indicator
@@ -549,6 +822,72 @@ class VoiceAssistantGUI:
         self._stat_uptime.set(f"{h:02d}:{m:02d}:{s:02d}")
         self.root.after(1000, self._tick_uptime)
 
+    def _tick_loading(self):
+        """Show the engine's start-up progress in the status bar until it is ready."""
+        state = getattr(self.recognizer, "load_state", "ready")
+        if state == "ready":
+            self._loading = False
+            self._sb_var.set("Ready.")
+            self._refresh_keyword_count()
+        elif state.startswith("failed"):
+            self._loading = False
+            self._sb_var.set(f"Start-up {state}")
+            self._set_status("Error", ERROR)
+        else:
+            self._sb_var.set(f"{state}…  {time.perf_counter() - self._load_t0:.1f} s")
+            self.root.after(100, self._tick_loading)
+
+    def _tick_stats(self):
+        """Poll the engine stats every 2 s on a worker thread.
+
+        Against a daemon these are HTTP calls; a slow or hung daemon must not
+        freeze the window, so the last values stay on screen until a fetch
+        completes and a new one only starts once the previous one is back.
+        """
+        if not self._stats_busy:
+            self._stats_busy = True
+            want_top = self._notebook.select() == str(self._hist_tab)
+            threading.Thread(target=self._fetch_stats, args=(want_top,),
+                             daemon=True, name="EAR-gui-stats").start()
+        self._refresh_keyword_count()   # tables may have been hot-reloaded
+        self.root.after(2000, self._tick_stats)
+
+    def _fetch_stats(self, want_top: bool):
+        try:
+            stats = self.recognizer.stats()
+        except Exception:
+            stats = None
+        top   = None
+        store = getattr(self.recognizer, "history", None)
+        if want_top and store is not None:
+            try:
+                top = store.top_triggers(5)
+            except Exception:
+                pass
+        self.message_queue.put(("stats", stats, top))
+
+    def _show_stats(self, stats: dict | None, top: list | None):
+        self._stats_busy = False
+        if top is not None:
+            self._hist_show_top(top)
+        if stats is None:
+            return   # keep the last values
+        vad = stats.get("vad")
+        self._stat_noise.set(f"{vad['dropped']} / {vad['dropped'] + vad['passed']}" if vad else "—")
+        noise = stats.get("noise")
+        self._stat_floor.set(f"{noise['floor']} / {noise['threshold']}"
+                             if noise and noise["floor"] else "—")
+        kws = stats.get("kws")
+        self._stat_kws.set(f"{kws['spotted']} / {kws['p50_ms']:.0f} ms"
+                           if kws and "p50_ms" in kws else "—")
+        latency = stats.get("latency", {})
+        for span, var in self._stat_latency.items():
+            if span in latency:
+                p50, p95, _ = latency[span]
+                var.set(f"{p50:.0f} / {p95:.0f}")
+            else:
+                var.set("—")
+
     # ──────────────────────────────────────────
     # Button actions
     # ──────────────────────────────────────────
@@ -558,56 +897,84 @@ class VoiceAssistantGUI:
         else:
             self.stop_listening()
 
+    # Engine calls below are HTTP requests when attached to a daemon: they
+    # run on a worker thread, the window updates at once.
     def start_listening(self):
-        self.recognizer._start_thread()
+        self._in_background(self.recognizer._start_thread, what="Start listening")
         self.listen_btn.configure(text="■  Stop Listening", style="Danger.TButton")
         self._set_status("Listening", SUCCESS)
         self._log("SYS", "Starting microphone…", color=ACCENT)
 
     def stop_listening(self):
-        self.recognizer.is_listening = False
+        self._in_background(lambda: setattr(self.recognizer, "is_listening", False),
+                            what="Stop listening")
         self.listen_btn.configure(text="▶  Start Listening", style="Primary.TButton")
         self._set_status("Idle", FG_DIM)
         self._log("SYS", "Microphone stopped.", color=FG_DIM)
 
     def calibrate_mic(self):
-        self._log("SYS", "Calibrating microphone…", color=ACCENT)
-        threading.Thread(target=self.recognizer.calibrer_micro,
-                         daemon=True).start()
+        # Instant locally (reads the rolling noise floor)
+        self._in_background(self.recognizer.calibrer_micro, what="Calibration")
 
     def test_audio(self):
         test_sound = "sounds/thx.mp3"
         if os.path.exists(test_sound):
             self._log("TEST", "Playing test sound…", color=ACCENT)
-            pygame.mixer.music.load(test_sound)
-            pygame.mixer.music.play()
+            self._in_background(lambda: self.recognizer.jouer_audio(test_sound),
+                                what="Test sound")
         else:
             self._log("TEST", "Test sound not found (sounds/thx.mp3)", color=WARN)
 
+    def stop_audio(self):
+        self._in_background(self.recognizer.arreter_audio, what="Stop sound")
+        self._log("SYS", "Sound stopped.", color=FG_DIM)
+
+    # Reloads wait for the engine (model load, listen thread join, or the
+    # daemon over HTTP): they run on a worker so the window stays responsive.
     def reload_keywords(self):
-        self.recognizer.reload_keywords()
-        self._refresh_keyword_count()
-        self._log("SYS", f"keywords.txt reloaded — {len(self.recognizer.commands)} commands", color=ACCENT)
+        def _done(_):
+            self._refresh_keyword_count()
+            self._log("SYS", f"keywords.txt reloaded — {len(self.recognizer.commands)} commands",
+                      color=ACCENT)
+        self._in_background(self.recognizer.reload_keywords, _done, "keywords.txt reload")
 
     def reload_actions(self):
-        self.recognizer.reload_actions()
-        n = len(self.recognizer.system_actions)
-        self._log("SYS", f"actions.ini reloaded — {n} actions", color=ACCENT)
+        def _done(_):
+            n = len(self.recognizer.system_actions)
+            self._log("SYS", f"actions.ini reloaded — {n} actions", color=ACCENT)
+        self._in_background(self.recognizer.reload_actions, _done, "actions.ini reload")
 
     def reload_config(self):
-        self.recognizer.reload_config()
-        self._log("SYS", "config.ini reloaded.", color=ACCENT)
-        self._refresh_keyword_count()
+        def _done(_):
+            self._log("SYS", "config.ini reloaded.", color=ACCENT)
+            self._refresh_keyword_count()
+        self._in_background(self.recognizer.reload_config, _done, "config.ini reload")
 
     def measure_threshold(self):
-        self._log("SYS", "Measuring ambient noise threshold…", color=ACCENT)
-        threading.Thread(target=self.recognizer.measure_threshold,
-                         daemon=True).start()
+        self._in_background(self.recognizer.measure_threshold, what="Threshold measure")
+
+    def export_traces(self):
+        path = filedialog.asksaveasfilename(
+            title="Export latency traces",
+            defaultextension=".csv",
+            initialfile=f"ear_traces_{datetime.now():%Y%m%d_%H%M%S}.csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")],
+        )
+        if not path:
+            return
+        self._in_background(
+            lambda: self.recognizer.export_traces(path),
+            lambda n: self._log("SYS", f"{n} traces exported to {os.path.basename(path)}",
+                                color=ACCENT),
+            what="Trace export")
 
     def clear_log(self):
         self.log_text.configure(state="normal")
         self.log_text.delete("1.0", tk.END)
         self.log_text.configure(state="disabled")
+        self._log_store.clear()
+        self._log_pending.clear()
+        self._log_rendered = 0
         self._log("SYS", "Log cleared.", color=FG_DIM)
 
     def _refresh_keyword_count(self):
@@ -622,9 +989,17 @@ class VoiceAssistantGUI:
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.eval("tk::PlaceWindow . center")
         self.root.mainloop()
+        # Flush the history writer (a daemon owns its own store)
+        store = getattr(self.recognizer, "history", None)
+        if store is not None and not getattr(self.recognizer, "is_remote", False):
+            store.close()
 
     def _on_close(self):
-        if self.recognizer.is_listening:
+        # Attached to a daemon: closing the window leaves the engine running
+        if getattr(self.recognizer, "is_remote", False):
+            self.recognizer.detach()
+            self.root.destroy()
+        elif self.recognizer.is_listening:
             self.stop_listening()
             self.root.after(400, self.root.destroy)
         else:
@@ -0,0 +1,145 @@
+"""
+EAR — Offline replay
+Feeds a folder of recorded WAV files through the real Vosk pipeline
+(VoskBackend.stream → _match → traiter_commande) instead of the microphone,
+with playback and action launching stubbed out, and reports throughput,
+per-stage latency and trigger precision / recall.
+
+Run from the ear/ folder:  python ear_replay.py recordings/
+
+Expected triggers come from recordings/labels.txt, keywords.txt style:
+    bonjour_01.wav   = bonjour
+    chaise_02.wav    = -            (nothing should fire)
+Files missing from labels.txt use their name: "au_revoir__3.wav" → "au revoir".
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")   # no sound card needed
+
+from ear import AudioCommandRecognizer, VoskBackend, load_config, logger, read_wav
+
+SILENCE_SEC = 0.6     # appended to each file so Vosk can close the utterance
+
+
+# ──────────────────────────────────────────────
+# Virtual microphone
+# ──────────────────────────────────────────────
+def virtual_mic(pcm: bytes):
+    """Yield (captured_at, block) like the sounddevice callback would."""
+    pcm  += bytes(int(SILENCE_SEC * VoskBackend.SAMPLERATE) * 2)
+    step  = VoskBackend.BLOCKSIZE * 2
+    for i in range(0, len(pcm), step):
+        yield time.perf_counter(), pcm[i:i + step]
+
+
+# ──────────────────────────────────────────────
+# Labels
+# ──────────────────────────────────────────────
+def load_labels(folder: str) -> dict:
+    """file name → expected trigger ("" = nothing should fire)."""
+    labels = {}
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(".wav"):
+            stem = os.path.splitext(name)[0].split("__")[0]
+            labels[name] = stem.replace("_", " ").lower()
+
+    path = os.path.join(folder, "labels.txt")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for raw in f:
+                line = raw.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                name, _, trigger = line.partition("=")
+                trigger = trigger.strip().lower()
+                labels[name.strip()] = "" if trigger == "-" else trigger
+    return labels
+
+
+# ──────────────────────────────────────────────
+# Replay
+# ──────────────────────────────────────────────
+def build_recognizer() -> AudioCommandRecognizer:
+    cfg = load_config()
+    cfg["recognition"]["backend"]        = "vosk"
+    cfg["recognition"]["vosk_streaming"] = "true"
+    cfg["commands"]["cooldown_sec"]       = "0"
+    cfg["commands"]["watch_interval_sec"] = "0"
+    cfg["commands"]["history_db"]         = ""   # keep synthetic commands out of history.db
+    app = AudioCommandRecognizer(cfg)
+    if not app.wait_ready():
+        raise SystemExit(f"Cannot load the Vosk backend: {app.load_error}")
+
+    # Stubs: record instead of playing sounds / launching apps
+    def _fake_play(fichier, priority=0, trace=None):
+        if trace:
+            trace.mark("play_start")
+
+    app.jouer_audio             = _fake_play
+    app.executer_action_systeme = lambda action_info: True
+    return app
+
+
+def replay(folder: str):
+    labels = load_labels(folder)
+    if not labels:
+        print(f"No .wav files in {folder}")
+        return
+
+    app = build_recognizer()
+    fired_log: list[str] = []
+    app.on_command_detected = lambda trigger, *_: fired_log.append(trigger)
+    app.is_listening = True
+
+    tp = fp = fn = 0
+    audio_sec = 0.0
+    mistakes  = []
+    t_start   = time.perf_counter()
+
+    for name, expected in labels.items():
+        path = os.path.join(folder, name)
+        if not os.path.exists(path):
+            continue
+        pcm = read_wav(path)
+        audio_sec += len(pcm) / 2 / VoskBackend.SAMPLERATE
+
+        fired_log.clear()
+        fired: set[str] = set()
+        for result in app._vosk.stream(running=lambda: True, source=virtual_mic(pcm)):
+            app._on_stream_result(*result, fired)
+
+        got = list(dict.fromkeys(fired_log))
+        hit = expected in got if expected else False
+        tp += hit
+        fn += bool(expected) and not hit
+        fp += len([t for t in got if t != expected])
+        if (expected and not hit) or any(t != expected for t in got):
+            mistakes.append((name, expected or "-", ", ".join(got) or "-"))
+
+    wall = time.perf_counter() - t_start
+    n    = len(labels)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall    = tp / (tp + fn) if tp + fn else 0.0
+
+    print(f"\nfiles        {n}  ({audio_sec:.1f} s of audio)")
+    print(f"throughput   {n / wall:.2f} utt/s  ({audio_sec / wall:.1f}x real time)")
+    print(f"precision    {precision:.3f}   recall {recall:.3f}   "
+          f"(tp {tp}, fp {fp}, fn {fn})")
+    print("\nlatency      p50 ms   p95 ms")
+    for span, (p50, p95, _) in app.traces.percentiles().items():
+        print(f"  {span:<10} {p50:>6.1f}   {p95:>6.1f}")
+    if mistakes:
+        print(f"\n{'file':<30} {'expected':<24} fired")
+        for name, expected, got in mistakes:
+            print(f"{name:<30} {expected:<24} {got}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or not os.path.isdir(sys.argv[1]):
+        print(__doc__)
+        sys.exit(1)
+    logger.setLevel("WARNING")
+    replay(sys.argv[1])
@@ -0,0 +1,151 @@
+"""
+Salle JVO — Micro-benchmarks du flux vidéo
+Lancer depuis le dossier flux/ :  python flux_bench.py [nom]
+
+jpeg   : coût CPU par frame pour N spectateurs d'un même preset —
+         resize + cv2.imencode par client (ancien chemin) vs. le cache
+         FrameHub.jpeg() qui encode une fois par frame et par preset.
+motion : CPU par frame analysée et par seconde de flux — ancien
+         detect_motion (640×360, flou 21×21, copie pleine résolution,
+         1 frame sur 2 à 25 i/s) vs. MotionEngine (miniature, fond moyen,
+         MOTION_FPS analyses/s) ; et rectangles trouvés par les deux.
+
+Importer flux_jvo ouvre la caméra et lance ses threads de fond, comme au
+démarrage du serveur ; les frames mesurées ici sont synthétiques.
+"""
+
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from flux_jvo import MOTION_FPS, QUALITY_PRESETS, FrameHub, MotionEngine, motion_threshold
+
+FRAMES = 50
+VIEWERS = (1, 2, 4, 8)
+
+
+# ─────────────────────────────────────────────
+#  Outils
+# ─────────────────────────────────────────────
+def _synthetic_frames(n):
+    """Frames 1280×720 bruitées (JPEG réaliste, pas une image unie)."""
+    rng = np.random.default_rng(3)
+    base = rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    base = cv2.GaussianBlur(base, (9, 9), 0)
+    return [np.roll(base, 8 * i, axis=1) for i in range(n)]
+
+
+def _moving_frames(n):
+    """Fond fixe bruité + un rectangle qui traverse l'image."""
+    rng = np.random.default_rng(5)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8), (31, 31), 0)
+    frames = []
+    for i in range(n):
+        frame = base.copy()
+        x = 40 + i * 1100 // n
+        cv2.rectangle(frame, (x, 250), (x + 140, 520), (20, 20, 200), -1)
+        frames.append(frame)
+    return frames
+
+
+def _cpu_ms_per_frame(fn, frames):
+    t0 = time.process_time()
+    for seq, frame in enumerate(frames, 1):
+        fn(seq, frame)
+    return (time.process_time() - t0) / len(frames) * 1000
+
+
+# ─────────────────────────────────────────────
+#  Encodage JPEG partagé
+# ─────────────────────────────────────────────
+def bench_jpeg():
+    frames = _synthetic_frames(FRAMES)
+    print(f"{'preset':<8} {'clients':>7} {'par client':>11} {'partagé':>9} {'gain':>6}")
+    for preset, q in QUALITY_PRESETS.items():
+        for n in VIEWERS:
+            def per_client(seq, frame):
+                for _ in range(n):
+                    cv2.imencode('.jpg', cv2.resize(frame, q["res"]),
+                                 [cv2.IMWRITE_JPEG_QUALITY, q["jpeg"]])[1].tobytes()
+
+            hub = FrameHub()
+
+            def shared(seq, frame):
+                for _ in range(n):
+                    hub.jpeg(seq, frame, preset)
+
+            old = _cpu_ms_per_frame(per_client, frames)
+            new = _cpu_ms_per_frame(shared, frames)
+            print(f"{preset:<8} {n:>7} {old:>9.1f}ms {new:>7.1f}ms {old / new:>5.1f}x")
+
+
+# ─────────────────────────────────────────────
+#  Détection de mouvement
+# ─────────────────────────────────────────────
+class _LegacyMotion:
+    """detect_motion() d'avant MotionEngine, pour comparaison."""
+
+    def __init__(self):
+        self.last_frame = None
+
+    def detect(self, current_frame):
+        resized_frame = cv2.resize(current_frame, (640, 360))
+        gray = cv2.cvtColor(resized_frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        if self.last_frame is None:
+            self.last_frame = gray
+            return False, current_frame, []
+        frame_diff = cv2.absdiff(self.last_frame, gray)
+        thresh = cv2.threshold(frame_diff, 25, 255, cv2.THRESH_BINARY)[1]
+        thresh = cv2.dilate(thresh, None, iterations=2)
+        contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        motion, boxes = False, []
+        output_frame = current_frame.copy()
+        for contour in contours:
+            if cv2.contourArea(contour) > motion_threshold:
+                motion = True
+                (x, y, w, h) = cv2.boundingRect(contour)
+                x, y, w, h = x*2, y*2, w*2, h*2
+                boxes.append((x, y, w, h))
+                cv2.rectangle(output_frame, (x, y), (x + w, y + h), (0, 255, 0), 3)
+        self.last_frame = gray
+        return motion, output_frame, boxes
+
+
+def bench_motion():
+    frames = _moving_frames(FRAMES)
+    legacy = _LegacyMotion()
+    engine = MotionEngine(FrameHub())   # sans thread : analyse() appelée directement
+    found = {"ancien": 0, "moteur": 0}
+
+    def old(seq, frame):
+        found["ancien"] += bool(legacy.detect(frame)[2])
+
+    def new(seq, frame):
+        found["moteur"] += bool(engine.analyse(frame))
+
+    old_ms = _cpu_ms_per_frame(old, frames)
+    new_ms = _cpu_ms_per_frame(new, frames)
+    old_rate, new_rate = 25 / 2, MOTION_FPS
+    print(f"{'':<10} {'ms/analyse':>10} {'analyses/s':>10} {'ms CPU/s':>9} {'mouvement':>10}")
+    print(f"{'ancien':<10} {old_ms:>10.2f} {old_rate:>10.1f} {old_ms * old_rate:>9.1f} "
+          f"{found['ancien']:>6}/{FRAMES}")
+    print(f"{'moteur':<10} {new_ms:>10.2f} {new_rate:>10.1f} {new_ms * new_rate:>9.1f} "
+          f"{found['moteur']:>6}/{FRAMES}")
+    print(f"\n{old_ms / new_ms:.0f}x moins de CPU par analyse, "
+          f"{old_ms * old_rate / (new_ms * new_rate):.0f}x par seconde de flux")
+
+
+BENCHES = {
+    "jpeg":   bench_jpeg,
+    "motion": bench_motion,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHES)
+    for name in names:
+        print(f"\n── {name} " + "─" * (40 - len(name)))
+        BENCHES[name]()
@@ -440,7 +440,6 @@ def save_html_file():
 # ─────────────────────────────────────────────
 camera = RobustCamera()
 motion_detected = False
-last_frame = None
 _latest_frame = None   # dernière frame brute pour snapshot à la demande
 motion_threshold = 1500
 capture_count = 0
@@ -491,87 +490,254 @@ def save_capture(frame):
     return None
 
 
-def detect_motion(current_frame):
-    global last_frame, motion_detected, ABSENT_MODE
-    if current_frame is None:
-        return False, None
-    resized_frame = cv2.resize(current_frame, (640, 360))
-    gray = cv2.cvtColor(resized_frame, cv2.COLOR_BGR2GRAY)
-    gray = cv2.GaussianBlur(gray, (21, 21), 0)
-    if last_frame is None:
-        last_frame = gray
-        return False, current_frame
-    frame_diff = cv2.absdiff(last_frame, gray)
-    thresh = cv2.threshold(frame_diff, 25, 255, cv2.THRESH_BINARY)[1]
-    thresh = cv2.dilate(thresh, None, iterations=2)
-    contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    motion_detected = False
-    output_frame = current_frame.copy()
-    for contour in contours:
-        if cv2.contourArea(contour) > motion_threshold:
-            motion_detected = True
-            (x, y, w, h) = cv2.boundingRect(contour)
-            x, y, w, h = x*2, y*2, w*2, h*2
-            cv2.rectangle(output_frame, (x, y), (x + w, y + h), (0, 255, 0), 3)
-            cv2.putText(output_frame, "MOTION DETECTED", (10, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 255), 3)
-    last_frame = gray
-    return motion_detected, output_frame
+# ─────────────────────────────────────────────
+#  DIFFUSION VIDÉO — producteur unique
+#  Un seul thread lit la caméra et publie la dernière image brute
+#  avec un numéro de séquence ; les analyses (MotionEngine,
+#  FaceWorker) la lisent sur leurs propres threads. Les clients
+#  MJPEG attendent la suivante : un client lent saute des images,
+#  il ne freine jamais la caméra. Chaque frame est encodée en JPEG
+#  au plus une fois par preset demandé, avec les rectangles des
+#  analyses dessinés sur l'image réduite ; tous les clients du
+#  preset reçoivent les mêmes bytes.
+# ─────────────────────────────────────────────
+class FrameHub:
+    def __init__(self):
+        self._cond   = threading.Condition()
+        self._frame  = None
+        self._seq    = 0
+        self._thread = None
+        self._jpeg   = {}   # preset → (seq, partie MJPEG déjà encodée)
+        self._enc_locks = {preset: threading.Lock() for preset in QUALITY_PRESETS}
+
+    def start(self):
+        """Démarre le thread producteur (une seule fois)."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="frame-hub")
+                self._thread.start()
+
+    def publish(self, frame):
+        with self._cond:
+            self._frame = frame
+            self._seq  += 1
+            self._cond.notify_all()
+
+    def wait(self, last_seq, timeout=2.0):
+        """Attend une frame plus récente que last_seq → (seq, frame), frame=None si délai dépassé."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq, timeout):
+                return last_seq, None
+            return self._seq, self._frame
+
+    def jpeg(self, seq, frame, preset):
+        """
+        Partie MJPEG de la frame seq au preset donné → (seq, bytes), bytes=None
+        si l'encodage échoue. Le premier client encode, les suivants
+        réutilisent le même objet ; seuls les presets demandés sont encodés.
+        """
+        with self._enc_locks[preset]:
+            cached = self._jpeg.get(preset)
+            if cached and cached[0] >= seq:
+                return cached
+            q = QUALITY_PRESETS[preset]
+            small = cv2.resize(frame, q["res"])
+            annotate(small, motion_engine.current_boxes(), face_worker.current_faces(),
+                     small.shape[1] / frame.shape[1], small.shape[0] / frame.shape[0])
+            ret, buffer = cv2.imencode('.jpg', small, [cv2.IMWRITE_JPEG_QUALITY, q["jpeg"]])
+            if not ret:
+                return seq, None
+            part = (b'--frame\r\n'
+                    b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            self._jpeg[preset] = (seq, part)
+            return seq, part
+
+    def _run(self):
+        global _latest_frame
+        frame_count = 0
+        log.info("[HUB] Producteur vidéo démarré")
+        while True:
+            try:
+                success, frame = camera.read()
+                if not success or frame is None:
+                    log.warning(f"[HUB] frame #{frame_count} — caméra indisponible, frame noire publiée")
+                    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+                    cv2.putText(frame, "CAMERA ERROR - RECONNECTION...", (50, 240),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                    self.publish(frame)
+                    time.sleep(0.5)
+                    continue
+                frame_count += 1
+                _latest_frame = frame   # snapshot à la demande (global)
+                if frame_count % 100 == 0:
+                    log.debug(f"[HUB] ✓ {frame_count} frames capturées, shape={frame.shape}")
+                self.publish(frame)
+            except Exception as e:
+                log.error(f"[HUB] Exception à la frame #{frame_count}: {type(e).__name__}: {e}")
+                log.debug(traceback.format_exc())
+                time.sleep(0.5)
+
+frame_hub = FrameHub()
+
+
+# ─────────────────────────────────────────────
+#  DÉTECTION DE MOUVEMENT
+#  Thread dédié, MOTION_FPS analyses par seconde sur une miniature
+#  en niveaux de gris comparée à un fond moyen glissant. Publie
+#  l'état courant (rectangles en coordonnées de la frame d'origine)
+#  et prévient les abonnés à chaque nouveau mouvement.
+# ─────────────────────────────────────────────
+MOTION_FPS        = 8           # analyses par seconde
+MOTION_PROXY      = (160, 90)   # taille de la miniature analysée
+MOTION_BG_ALPHA   = 0.05        # vitesse d'adaptation du fond (0..1)
+MOTION_DIFF       = 25          # écart de luminosité significatif (0..255)
+MOTION_COOLDOWN_S = 1.2         # délai minimal entre deux événements
+MOTION_HOLD_S     = 0.5         # durée d'affichage des rectangles
+
+def annotate(image, boxes=(), faces=(), sx=1.0, sy=1.0):
+    """
+    Dessine en place les rectangles de mouvement et les visages
+    (x, y, w, h, nom, couleur) sur image ; coordonnées × (sx, sy) quand
+    image est une version réduite de la frame analysée.
+    """
+    thick = max(1, round(3 * sx))
+    for (x, y, w, h) in boxes:
+        cv2.rectangle(image, (int(x * sx), int(y * sy)),
+                      (int((x + w) * sx), int((y + h) * sy)), (0, 255, 0), thick)
+    if boxes:
+        cv2.putText(image, "MOTION DETECTED", (10, int(50 * sy)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.5 * sx, (0, 0, 255), thick)
+    for (x, y, w, h, name, color) in faces:
+        x, y, w, h = int(x * sx), int(y * sy), int(w * sx), int(h * sy)
+        cv2.rectangle(image, (x, y), (x + w, y + h), color, 2)
+        cv2.putText(image, name, (x, y - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    return image
+
+
+class MotionEngine:
+    def __init__(self, hub, fps=MOTION_FPS, proxy=MOTION_PROXY):
+        self.hub   = hub
+        self.fps   = fps
+        self.proxy = proxy
+        self._bg   = None              # fond moyen (float32, taille proxy)
+        self._lock = threading.Lock()
+        self._state = (0, [], 0.0)    # (seq, rectangles, instant)
+        self._subscribers = []
+        self._last_event  = 0.0
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self.hub.start()
+                self._thread = threading.Thread(target=self._run, daemon=True, name="motion")
+                self._thread.start()
+
+    def subscribe(self, fn):
+        """fn(frame, boxes) est appelé à chaque nouveau mouvement (après MOTION_COOLDOWN_S)."""
+        self._subscribers.append(fn)
+
+    def state(self):
+        """(seq de la frame analysée, rectangles, instant time.monotonic())."""
+        with self._lock:
+            return self._state
+
+    def current_boxes(self):
+        """Rectangles de la dernière analyse, s'ils ont moins de MOTION_HOLD_S."""
+        _, boxes, at = self.state()
+        return boxes if time.monotonic() - at < MOTION_HOLD_S else []
+
+    def analyse(self, frame):
+        """Rectangles de mouvement (x, y, w, h) en coordonnées de frame."""
+        small = cv2.resize(frame, self.proxy, interpolation=cv2.INTER_LINEAR)
+        gray  = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        if self._bg is None or self._bg.shape != gray.shape:
+            self._bg = gray.astype(np.float32)
+            return []
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._bg))
+        cv2.accumulateWeighted(gray, self._bg, MOTION_BG_ALPHA)
+        mask = cv2.threshold(diff, MOTION_DIFF, 255, cv2.THRESH_BINARY)[1]
+        mask = cv2.dilate(mask, None, iterations=1)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # motion_threshold est exprimé en pixels d'une image 640×360
+        min_area = motion_threshold * self.proxy[0] * self.proxy[1] / (640 * 360)
+        sx = frame.shape[1] / self.proxy[0]
+        sy = frame.shape[0] / self.proxy[1]
+        boxes = []
+        for contour in contours:
+            if cv2.contourArea(contour) > min_area:
+                x, y, w, h = cv2.boundingRect(contour)
+                boxes.append((int(x * sx), int(y * sy), int(w * sx), int(h * sy)))
+        return boxes
+
+    def _run(self):
+        global motion_detected
+        log.info(f"[MOTION] Moteur démarré ({self.fps} analyses/s, miniature {self.proxy})")
+        seq = 0
+        while True:
+            t0 = time.monotonic()
+            seq, frame = self.hub.wait(seq)
+            if frame is None:
+                continue
+            try:
+                boxes = self.analyse(frame)
+            except Exception as e:
+                log.error(f"[MOTION] Erreur d'analyse : {type(e).__name__}: {e}")
+                time.sleep(0.5)
+                continue
+            now = time.monotonic()
+            with self._lock:
+                self._state = (seq, boxes, now)
+            motion_detected = bool(boxes)
+            if boxes and now - self._last_event >= MOTION_COOLDOWN_S:
+                self._last_event = now
+                for fn in list(self._subscribers):
+                    try:
+                        fn(frame, boxes)
+                    except Exception as e:
+                        log.error(f"[MOTION] Abonné en erreur : {e}")
+            time.sleep(max(0.0, 1.0 / self.fps - (time.monotonic() - t0)))
+
+motion_engine = MotionEngine(frame_hub)
+
+
+def _on_motion(frame, boxes):
+    """Captures et mode absent sur nouveau mouvement."""
+    if not (SAVE_CAPTURES or ABSENT_MODE):
+        return
+    annotated = annotate(frame.copy(), boxes)
+    if SAVE_CAPTURES:
+        log.info("[MOTION] Mouvement détecté — capture sauvegardée")
+        save_capture(annotated)
+    if ABSENT_MODE:
+        log.info("[ABSENT] Mouvement détecté — snapshot + audio")
+        save_capture(annotated)
+        _trigger_absent_alert()
+
+motion_engine.subscribe(_on_motion)
 
 
 def generate_frames():
-    global motion_detected, _latest_frame
-    motion_cooldown = 0
-    face_frame_skip = 0   # reconnaissance faciale : 1 frame analysée sur 6 (coût LBPH)
-    frame_count = 0
+    """Flux MJPEG d'un client : attend chaque nouvelle frame du FrameHub et envoie son JPEG partagé."""
+    start_video_workers()
+    seq = 0
+    sent = 0
     log.info("[STREAM] generate_frames() démarré")
     while True:
         try:
-            success, frame = camera.read()
-            if not success or frame is None:
-                log.warning(f"[STREAM] frame #{frame_count} — caméra indisponible, frame noire envoyée")
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                cv2.putText(frame, "CAMERA ERROR - RECONNECTION...", (50, 240),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            else:
-                frame_count += 1
-                _latest_frame = frame   # snapshot à la demande (global)
-                if frame_count % 100 == 0:
-                    log.debug(f"[STREAM] ✓ {frame_count} frames envoyées, shape={frame.shape}")
-                if frame_count % 2 == 0:
-                    motion_detected, frame = detect_motion(frame)
-                    if motion_detected and motion_cooldown == 0:
-                        if SAVE_CAPTURES:
-                            log.info("[STREAM] Mouvement détecté — capture sauvegardée")
-                            save_capture(frame)
-                        if ABSENT_MODE:
-                            log.info("[ABSENT] Mouvement détecté — snapshot + audio")
-                            save_capture(frame)
-                            _trigger_absent_alert()
-                        motion_cooldown = 30
-                if motion_cooldown > 0:
-                    motion_cooldown -= 1
-                # Reconnaissance faciale (coûteuse — 1 frame sur 6)
-                if FACE_RECOGNITION_ENABLED:
-                    face_frame_skip += 1
-                    if face_frame_skip >= 6:
-                        face_frame_skip = 0
-                        frame, recognized = recognize_faces(frame)
-                        if recognized:
-                            log.info(f"[FACE] Reconnu(e) : {', '.join(recognized)}")
-                            save_capture(frame)
-                            _trigger_face_alert(recognized)
-            q      = QUALITY_PRESETS[stream_quality]
+            seq, frame = frame_hub.wait(seq)
+            if frame is None:
+                continue   # producteur bloqué (caméra) — on attend la suite
+            preset = stream_quality
             # Limite fps selon le preset (fps_div=2 → on saute 1 frame sur 2)
-            if frame_count % q["fps_div"] != 0:
+            if seq % QUALITY_PRESETS[preset]["fps_div"] != 0:
                 continue
-            stream_frame = cv2.resize(frame, q["res"])
-            ret, buffer = cv2.imencode('.jpg', stream_frame, [cv2.IMWRITE_JPEG_QUALITY, q["jpeg"]])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            seq, part = frame_hub.jpeg(seq, frame, preset)
+            if part is not None:
+                sent += 1
+                yield part
             else:
-                log.error(f"[STREAM] cv2.imencode() a échoué à la frame #{frame_count}")
+                log.error(f"[STREAM] cv2.imencode() a échoué à la frame #{seq}")
                 error_frame = np.zeros((540, 960, 3), dtype=np.uint8)
                 cv2.putText(error_frame, "ENCODING ERROR", (300, 270),
                             cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
@@ -579,10 +745,10 @@ def generate_frames():
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
         except GeneratorExit:
-            log.info(f"[STREAM] Client déconnecté après {frame_count} frames (GeneratorExit normal)")
+            log.info(f"[STREAM] Client déconnecté après {sent} frames (GeneratorExit normal)")
             break
         except Exception as e:
-            log.error(f"[STREAM] Exception à la frame #{frame_count}: {type(e).__name__}: {e}")
+            log.error(f"[STREAM] Exception à la frame #{seq}: {type(e).__name__}: {e}")
             log.debug(traceback.format_exc())
             time.sleep(0.5)
             try:
@@ -951,39 +1117,222 @@ def train_face_model():
         log.info(f"[FACE] Modèle entraîné : {len(people)} personne(s), {len(faces_data)} photo(s)")
         return True
 
-def recognize_faces(frame):
+FACE_FPS          = 8       # analyses par seconde (suivi ; la cascade Haar tourne bien moins)
+FACE_DETECT_WIDTH = 480     # largeur de l'image réduite où l'on cherche les visages
+FACE_HOLD_S       = 1.0     # durée d'affichage des cadres après une analyse
+FACE_REDETECT_S   = 2.0     # détection Haar au moins toutes les N secondes
+FACE_SEARCH_S     = 0.25    # sans visage suivi : une détection toutes les N secondes
+FACE_TRACK_SCORE  = 0.6     # corrélation minimale pour suivre un visage sans redétection
+FACE_TRACK_MISSES = 2       # détections sans le visage avant d'abandonner sa piste
+
+def _identify_face(frame, box):
+    """Nom LBPH du visage box=(x, y, w, h) en pleine résolution, None si inconnu."""
+    recognizer, labels = _face_recognizer, _face_labels   # train_face_model() peut les remplacer
+    if recognizer is None or not labels:
+        return None
+    x, y, w, h = box
+    try:
+        face_roi = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
+        label_id, confidence = recognizer.predict(cv2.resize(face_roi, (200, 200)))
+    except Exception as e:
+        log.debug(f"[FACE] Erreur prediction: {e}")
+        return None
+    if confidence < FACE_CONFIDENCE_THRESHOLD and label_id in labels:
+        return labels[label_id]
+    return None
+
+def _note_recognitions(names):
+    global _last_recognitions
+    ts = datetime.datetime.now().strftime("%H:%M:%S")
+    for name in names:
+        _last_recognitions.insert(0, {"name": name, "time": ts})
+    _last_recognitions = _last_recognitions[:MAX_RECOGNITIONS_LOG]
+
+
+class FaceTracker:
     """
-    Détecte et identifie les visages dans une frame BGR.
-    Retourne (frame_annotée, liste de noms reconnus dans cette frame).
+    Suit les visages entre deux détections Haar. Chaque piste garde son
+    identité LBPH et se recale par corrélation (matchTemplate) autour de
+    sa dernière position sur l'image réduite. La cascade ne tourne que
+    quand une piste est perdue, toutes les FACE_REDETECT_S secondes, ou
+    toutes les FACE_SEARCH_S secondes s'il n'y a aucune piste ; ses
+    détections sont associées aux pistes par IoU, puis par distance des
+    centres. Un nom n'est signalé qu'une fois par piste, c'est-à-dire une
+    fois par passage de la personne.
     """
-    global _last_recognitions
-    if frame is None or not FACE_RECOGNITION_ENABLED:
-        return frame, []
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    detected = _face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(80, 80))
-    recognized_names = []
-    output = frame.copy()
-    for (x, y, w, h) in detected:
-        name = "Inconnu"
-        color = (0, 165, 255)  # orange = non identifié
-        if _face_recognizer is not None and _face_labels:
+
+    def __init__(self, width=FACE_DETECT_WIDTH):
+        self.width = width
+        self.tracks = []            # {"box", "patch", "name", "misses"} — coordonnées réduites
+        self.analyses = 0
+        self.detections = 0
+        self._last_detect = 0.0
+        self._lost = False
+
+    def reset(self):
+        self.tracks = []
+        self._lost = False
+
+    def step(self, frame, now):
+        """Une analyse → (visages [(x, y, w, h, nom, couleur)] pleine résolution, noms nouveaux)."""
+        self.analyses += 1
+        scale = min(1.0, self.width / frame.shape[1])
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) \
+            if scale < 1.0 else frame
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        period = FACE_REDETECT_S if self.tracks else FACE_SEARCH_S
+        if self._lost or now - self._last_detect >= period:
+            new_names = self._detect(gray, frame, scale, now)
+        else:
+            self._follow(gray)
+            new_names = []
+        faces = []
+        for t in self.tracks:
+            if t["misses"]:
+                continue
+            x, y, w, h = (int(v / scale) for v in t["box"])
+            if t["name"]:
+                faces.append((x, y, w, h, t["name"], (0, 220, 0)))     # vert = identifié
+            else:
+                faces.append((x, y, w, h, "Inconnu", (0, 165, 255)))   # orange = non identifié
+        return faces, new_names
+
+    def _follow(self, gray):
+        """Recale chaque piste sur l'image courante ; une corrélation trop faible = piste perdue."""
+        H, W = gray.shape
+        for t in self.tracks:
+            if t["misses"]:
+                continue
+            x, y, w, h = t["box"]
+            x0, y0 = max(0, x - w // 2), max(0, y - h // 2)
+            window = gray[y0:min(H, y + h + h // 2), x0:min(W, x + w + w // 2)]
+            if window.shape[0] < h or window.shape[1] < w:
+                self._lost = True
+                continue
+            _, score, _, (mx, my) = cv2.minMaxLoc(
+                cv2.matchTemplate(window, t["patch"], cv2.TM_CCOEFF_NORMED))
+            if score < FACE_TRACK_SCORE:
+                self._lost = True
+                continue
+            t["box"] = (x0 + mx, y0 + my, w, h)
+
+    @staticmethod
+    def _match_key(a, b):
+        """(IoU, -distance des centres / taille) : plus grand = meilleur appariement."""
+        ax, ay, aw, ah = a
+        bx, by, bw, bh = b
+        iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+        ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+        inter = iw * ih
+        iou = inter / float(aw * ah + bw * bh - inter)
+        dist = ((ax + aw / 2 - bx - bw / 2) ** 2 + (ay + ah / 2 - by - bh / 2) ** 2) ** 0.5
+        return iou, -dist / max(aw, bw)
+
+    def _detect(self, gray, frame, scale, now):
+        self.detections += 1
+        self._last_detect, self._lost = now, False
+        min_side = max(24, int(80 * scale))
+        boxes = [tuple(int(v) for v in b) for b in
+                 _face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(min_side, min_side))]
+
+        pairs = sorted(((self._match_key(t["box"], b), ti, bi)
+                        for ti, t in enumerate(self.tracks) for bi, b in enumerate(boxes)),
+                       reverse=True)
+        used_t, used_b = set(), set()
+        for (iou, neg_dist), ti, bi in pairs:
+            if ti in used_t or bi in used_b or (iou < 0.3 and neg_dist < -0.5):
+                continue
+            used_t.add(ti)
+            used_b.add(bi)
+            self.tracks[ti].update(box=boxes[bi], misses=0)
+
+        for ti, t in enumerate(self.tracks):
+            if ti not in used_t:
+                t["misses"] += 1
+        self.tracks = [t for t in self.tracks if t["misses"] < FACE_TRACK_MISSES]
+        for bi, box in enumerate(boxes):
+            if bi not in used_b:
+                self.tracks.append({"box": box, "name": None, "misses": 0})
+
+        new_names = []
+        for t in self.tracks:
+            if t["misses"]:
+                continue
+            x, y, w, h = t["box"]
+            t["patch"] = gray[y:y+h, x:x+w].copy()
+            if t["name"] is None:   # identité inconnue : nouvel essai LBPH à chaque détection
+                t["name"] = _identify_face(frame, tuple(int(v / scale) for v in t["box"]))
+                if t["name"]:
+                    new_names.append(t["name"])
+        return new_names
+
+
+class FaceWorker:
+    """
+    Reconnaissance faciale hors du flux : lit la dernière frame du
+    FrameHub à FACE_FPS quand FACE_RECOGNITION_ENABLED est actif, suit
+    les visages (FaceTracker) et garde leurs cadres, que l'encodeur
+    dessine sur chaque image envoyée.
+    """
+
+    def __init__(self, hub, fps=FACE_FPS, width=FACE_DETECT_WIDTH):
+        self.hub   = hub
+        self.fps   = fps
+        self.tracker = FaceTracker(width)
+        self._lock = threading.Lock()
+        self._overlay = ([], 0.0)    # (visages, instant time.monotonic())
+        self._thread  = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self.hub.start()
+                self._thread = threading.Thread(target=self._run, daemon=True, name="faces")
+                self._thread.start()
+
+    def current_faces(self):
+        """Cadres de la dernière analyse, s'ils ont moins de FACE_HOLD_S."""
+        with self._lock:
+            faces, at = self._overlay
+        if not FACE_RECOGNITION_ENABLED or time.monotonic() - at >= FACE_HOLD_S:
+            return []
+        return faces
+
+    def _run(self):
+        log.info(f"[FACE] Worker démarré ({self.fps} analyses/s, "
+                 f"détection sur {self.tracker.width} px)")
+        seq = 0
+        while True:
+            if not FACE_RECOGNITION_ENABLED:
+                self.tracker.reset()   # nouvelles pistes (et alertes) à la réactivation
+                time.sleep(0.5)
+                continue
+            t0 = time.monotonic()
+            seq, frame = self.hub.wait(seq)
+            if frame is None:
+                continue
             try:
-                face_roi = cv2.resize(gray[y:y+h, x:x+w], (200, 200))
-                label_id, confidence = _face_recognizer.predict(face_roi)
-                if confidence < FACE_CONFIDENCE_THRESHOLD and label_id in _face_labels:
-                    name = _face_labels[label_id]
-                    color = (0, 220, 0)  # vert = identifié
-                    recognized_names.append(name)
+                faces, recognized = self.tracker.step(frame, t0)
             except Exception as e:
-                log.debug(f"[FACE] Erreur prediction: {e}")
-        cv2.rectangle(output, (x, y), (x + w, y + h), color, 2)
-        cv2.putText(output, name, (x, y - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-    if recognized_names:
-        ts = datetime.datetime.now().strftime("%H:%M:%S")
-        for name in recognized_names:
-            _last_recognitions.insert(0, {"name": name, "time": ts})
-        _last_recognitions = _last_recognitions[:MAX_RECOGNITIONS_LOG]
-    return output, recognized_names
+                log.error(f"[FACE] Erreur d'analyse : {type(e).__name__}: {e}")
+                time.sleep(0.5)
+                continue
+            with self._lock:
+                self._overlay = (faces, time.monotonic())
+            if recognized:
+                log.info(f"[FACE] Reconnu(e) : {', '.join(recognized)}")
+                _note_recognitions(recognized)
+                save_capture(annotate(frame.copy(), faces=faces))
+                _trigger_face_alert(recognized)
+            time.sleep(max(0.0, 1.0 / self.fps - (time.monotonic() - t0)))
+
+face_worker = FaceWorker(frame_hub)
+
+
+def start_video_workers():
+    """Producteur caméra + analyses (idempotent)."""
+    motion_engine.start()
+    face_worker.start()
 
 _load_face_labels()
 _load_face_model()
@@ -1063,7 +1412,10 @@ def face_status():
     return jsonify({
         "active": FACE_RECOGNITION_ENABLED,
         "model_ready": _face_recognizer is not None,
-        "people": sorted(_face_labels.values()) if _face_labels else []
+        "people": sorted(_face_labels.values()) if _face_labels else [],
+        "tracking": {"tracks": len(face_worker.tracker.tracks),
+                     "analyses": face_worker.tracker.analyses,
+                     "detections": face_worker.tracker.detections},
     })
 
 @app.route('/faces/people')
@@ -3186,6 +3538,7 @@ if __name__ == '__main__':
     log.info("Démarrage du serveur...")
     log.info("[MICRO] Micro en veille — s'active à la demande via le bouton Écouter")
     save_html_file()
+    start_video_workers()   # détection mouvement / visages active même sans spectateur
     ip_address = get_local_ip()
     # Démarrer ngrok si token présent (avant Flask pour avoir l'URL dès le départ)
     public_url = start_ngrok(port=5000)